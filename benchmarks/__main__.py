@@ -0,0 +1,98 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Callable
+
+from leaftracker.adapters.elastic_client import get_client
+from leaftracker.service_layer.elastic_uow import ElasticUnitOfWork
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+from benchmarks.cases import CASES, SIZES
+from benchmarks.harness import Measurement, load_baseline, measure, regressions, save_baseline
+
+BASELINE = Path(__file__).parent / "baseline.json"
+BENCH_PREFIX = "bench_"
+
+
+def elastic_uow() -> UnitOfWork:
+    uow = ElasticUnitOfWork(BENCH_PREFIX)
+
+    for repository in (uow.species(), uow.batches(), uow.sources()):
+        repository.index.lifecycle.reset()
+
+    return uow
+
+
+BACKENDS: dict[str, Callable[[], UnitOfWork]] = {
+    "memory": MemoryUnitOfWork,
+    "elastic": elastic_uow,
+}
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Benchmark the domain, mapping and services.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["memory"])
+    parser.add_argument("--case", default="", help="Only run cases whose name starts with this.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store results as the new baseline.")
+    parser.add_argument("--compare", action="store_true", help="Fail when throughput drops below the baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def available_backends(requested: list[str]) -> list[str]:
+    if "elastic" in requested and not get_client().ping():
+        print("Elasticsearch is not reachable, skipping the elastic backend.", file=sys.stderr)
+        return [backend for backend in requested if backend != "elastic"]
+    return requested
+
+
+def report(measurement: Measurement) -> None:
+    summary = measurement.summary()
+    print(
+        f"{measurement.case:<30} {measurement.backend:<8} {measurement.size:>8} "
+        f"{summary['throughput']:>12.1f} {summary['p50_ms']:>10.4f} {summary['p95_ms']:>10.4f} "
+        f"{summary['p99_ms']:>10.4f} {summary['peak_kib']:>12.1f}"
+    )
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    backends = available_backends(args.backends)
+    measurements = []
+
+    print(f"{'case':<30} {'backend':<8} {'size':>8} {'ops/s':>12} {'p50 ms':>10} {'p95 ms':>10} "
+          f"{'p99 ms':>10} {'peak KiB':>12}")
+
+    for case in CASES:
+        if not case.name.startswith(args.case):
+            continue
+
+        for size in args.sizes:
+            if case.needs_uow:
+                for backend in backends:
+                    measurement = measure(case, size, args.iterations, BACKENDS[backend](), backend)
+                    report(measurement)
+                    measurements.append(measurement)
+            else:
+                measurement = measure(case, size, args.iterations)
+                report(measurement)
+                measurements.append(measurement)
+
+    if args.save:
+        save_baseline(args.baseline, measurements)
+
+    if args.compare:
+        found = regressions(measurements, load_baseline(args.baseline), args.tolerance)
+        for regression in found:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if found else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
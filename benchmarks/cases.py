@@ -0,0 +1,103 @@
+from leaftracker.adapters.documents import document_to_species, species_to_document
+from leaftracker.domain.model import Batch, BatchType, Source, SourceType, Species, Stock, StockSize, TaxonName
+from leaftracker.service_layer import services
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+from benchmarks.harness import Case, Operation
+
+SIZES = (10, 1_000, 100_000)
+COMMIT_SIZE = 100
+
+
+def species_name(number: int) -> str:
+    return f"Genus{number % 997} species{number}"
+
+
+def make_species(size: int) -> list[Species]:
+    return [Species(species_name(number), reference=f"species-{number:06}") for number in range(size)]
+
+
+def make_batch(size: int) -> Batch:
+    batch = Batch(Source("Trillion Trees", SourceType.NURSERY), BatchType.DELIVERY)
+    sizes = list(StockSize)
+
+    for number in range(size):
+        batch.add(Stock(f"species-{number % (size // 10 + 1):06}", quantity=number % 50 + 1,
+                        size=sizes[number % len(sizes)]))
+
+    return batch
+
+
+def populate(uow: UnitOfWork, size: int) -> list[str]:
+    with uow:
+        added = [Species(species_name(number)) for number in range(size)]
+        for species in added:
+            uow.species().add(species)
+        uow.commit()
+
+    return [species.reference for species in added if species.reference is not None]
+
+
+def batch_add(size: int, uow: UnitOfWork | None) -> Operation:
+    batch = make_batch(size)
+    return lambda iteration: batch.add(Stock(f"species-{iteration % 100:06}", 1, StockSize.TUBE))
+
+
+def batch_quantity(size: int, uow: UnitOfWork | None) -> Operation:
+    batch = make_batch(size)
+    species = batch.species()
+    return lambda iteration: batch.quantity(species[iteration % len(species)])
+
+
+def taxon_name(size: int, uow: UnitOfWork | None) -> Operation:
+    names = [species_name(number) for number in range(size)]
+    return lambda iteration: TaxonName(names[iteration % size])
+
+
+def to_document(size: int, uow: UnitOfWork | None) -> Operation:
+    species = make_species(size)
+    return lambda iteration: species_to_document(species[iteration % size])
+
+
+def from_document(size: int, uow: UnitOfWork | None) -> Operation:
+    documents = [species_to_document(species) for species in make_species(size)]
+    return lambda iteration: document_to_species(documents[iteration % size])
+
+
+def add_species(size: int, uow: UnitOfWork | None) -> Operation:
+    assert uow is not None
+    populate(uow, size)
+    return lambda iteration: services.add_species(f"Addendum species{iteration}", uow)
+
+
+def rename_species(size: int, uow: UnitOfWork | None) -> Operation:
+    assert uow is not None
+    references = populate(uow, size)
+    return lambda iteration: services.rename_species(
+        references[iteration % len(references)], f"Renamed species{iteration}", uow
+    )
+
+
+def commit_species(size: int, uow: UnitOfWork | None) -> Operation:
+    assert uow is not None
+    populate(uow, size)
+
+    def operation(iteration: int):
+        with uow:
+            for number in range(COMMIT_SIZE):
+                uow.species().add(Species(f"Committed species{iteration * COMMIT_SIZE + number}"))
+            uow.commit()
+
+    return operation
+
+
+CASES = [
+    Case("domain.batch_add", batch_add),
+    Case("domain.batch_quantity", batch_quantity),
+    Case("domain.taxon_name", taxon_name),
+    Case("mapping.species_to_document", to_document),
+    Case("mapping.document_to_species", from_document),
+    Case("services.add_species", add_species, needs_uow=True),
+    Case("services.rename_species", rename_species, needs_uow=True),
+    Case("repository.commit", commit_species, needs_uow=True),
+]
@@ -0,0 +1,111 @@
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+Operation = Callable[[int], object]
+Setup = Callable[[int, UnitOfWork | None], Operation]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Setup
+    needs_uow: bool = False
+
+
+@dataclass
+class Measurement:
+    case: str
+    backend: str
+    size: int
+    iterations: int
+    seconds: float
+    latencies: list[float]
+    peak_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}/{self.backend}/{self.size}"
+
+    @property
+    def throughput(self) -> float:
+        return self.iterations / self.seconds if self.seconds else float("inf")
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percent - 1]
+
+    def summary(self) -> dict:
+        return {
+            "throughput": round(self.throughput, 1),
+            "p50_ms": round(self.percentile(50) * 1000, 4),
+            "p95_ms": round(self.percentile(95) * 1000, 4),
+            "p99_ms": round(self.percentile(99) * 1000, 4),
+            "peak_kib": round(self.peak_bytes / 1024, 1),
+        }
+
+
+def measure(case: Case, size: int, iterations: int, uow: UnitOfWork | None = None,
+            backend: str = "none") -> Measurement:
+    tracemalloc.start()
+    try:
+        operation = case.setup(size, uow)
+        operation(0)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies = []
+    started = time.perf_counter()
+
+    for iteration in range(1, iterations + 1):
+        before = time.perf_counter()
+        operation(iteration)
+        latencies.append(time.perf_counter() - before)
+
+    seconds = time.perf_counter() - started
+
+    return Measurement(
+        case=case.name,
+        backend=backend,
+        size=size,
+        iterations=iterations,
+        seconds=seconds,
+        latencies=latencies,
+        peak_bytes=peak_bytes,
+    )
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, measurements: list[Measurement]) -> None:
+    baseline = load_baseline(path)
+    baseline.update({measurement.key: measurement.summary() for measurement in measurements})
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def regressions(measurements: list[Measurement], baseline: dict[str, dict],
+                tolerance: float) -> list[str]:
+    found = []
+
+    for measurement in measurements:
+        expected = baseline.get(measurement.key)
+        if expected is None:
+            continue
+
+        throughput = measurement.throughput
+        if throughput < expected["throughput"] * (1 - tolerance):
+            found.append(f"{measurement.key}: {throughput:.1f} ops/s, baseline {expected['throughput']:.1f} ops/s")
+
+    return found
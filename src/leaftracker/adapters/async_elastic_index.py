@@ -0,0 +1,186 @@
+from elasticsearch import AsyncElasticsearch, NotFoundError
+
+from leaftracker.adapters.elastic_client import get_async_client
+from leaftracker.adapters.elastic_index import (
+    BULK_CHUNK_SIZE, TRUNCATE_THRESHOLD, BulkResult, Document, RefreshPolicy, Version, bulk_operations,
+    found_version, hit_to_document, index_version, logger, mapping_differences, readiness, reset_actions,
+    versioned_name, write_alias
+)
+
+
+class AsyncLifecycle:
+    def __init__(self, name: str, mappings: dict, client: AsyncElasticsearch | None = None,
+                 settings: dict | None = None):
+        self._client = client or get_async_client()
+        self._name = name
+        self._mappings = mappings
+        self._settings = settings
+
+    @property
+    def write_alias(self) -> str:
+        return write_alias(self._name)
+
+    async def create(self):
+        if readiness.is_ready(self._name, self._mappings, self._settings):
+            return
+
+        if not await self.exists():
+            await self._client.indices.create(
+                index=versioned_name(self._name, 1),
+                mappings=self._mappings,
+                settings=self._settings,
+                aliases={self._name: {}, self.write_alias: {"is_write_index": True}},
+            )
+            readiness.mark_ready(self._name, self._mappings, self._settings)
+            return
+
+        aliased = (await self._client.indices.exists_alias(name=self.write_alias)).body
+        differences = mapping_differences(await self.live_mappings(), self._mappings)
+
+        if not aliased:
+            differences.append(f"{self.write_alias} is missing")
+        if differences:
+            logger.warning("Index %s needs a migration: %s", self._name, ", ".join(differences))
+
+        readiness.mark_ready(self._name, self._mappings, self._settings,
+                             write_target=self.write_alias if aliased else self._name)
+
+    async def delete(self) -> None:
+        readiness.invalidate(self._name)
+        indices = await self.backing_indices()
+
+        if indices:
+            await self._client.options(ignore_status=404).indices.delete(index=indices)
+
+    async def reset(self) -> None:
+        indices = await self.backing_indices()
+
+        if not indices:
+            await self.create()
+            return
+
+        target = versioned_name(self._name, max(index_version(index) for index in indices) + 1)
+
+        await self._client.indices.create(index=target, mappings=self._mappings, settings=self._settings)
+        await self._client.indices.update_aliases(actions=reset_actions(self._name, target, indices))
+        readiness.mark_ready(self._name, self._mappings, self._settings)
+
+    async def backing_indices(self) -> list[str]:
+        response = await self._client.options(ignore_status=404).indices.get_alias(
+            index=[self._name, self.write_alias], ignore_unavailable=True
+        )
+        if response.meta.status == 404:
+            return []
+        return sorted(response.body)
+
+    async def exists(self) -> bool:
+        return (await self._client.indices.exists(index=self._name)).body
+
+    async def live_mappings(self) -> dict:
+        response = await self._client.indices.get_mapping(index=self._name)
+        return next(iter(response.body.values()))["mappings"]
+
+
+class AsyncIndex:
+    def __init__(self, name: str, mappings: dict, client: AsyncElasticsearch | None = None,
+                 settings: dict | None = None):
+        self._client = client or get_async_client()
+        self._name = name
+        self._mappings = mappings
+
+        self.lifecycle = AsyncLifecycle(name, mappings, self._client, settings)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def client(self) -> AsyncElasticsearch:
+        return self._client
+
+    async def refresh(self) -> None:
+        await self._client.indices.refresh(index=[self._name, write_alias(self._name)], ignore_unavailable=True)
+
+    async def document_count(self) -> int:
+        return (await self._client.count(index=self._name))["count"]
+
+    async def delete_all_documents(self, truncate: bool | None = None) -> None:
+        if truncate is None:
+            truncate = await self.document_count() >= TRUNCATE_THRESHOLD
+
+        if truncate:
+            await self.lifecycle.reset()
+            return
+
+        await self._client.delete_by_query(
+            index=self._name,
+            body={
+                "query": {"match_all": {}}
+            },
+            refresh=True,
+        )
+
+    async def document_exists(self, document_id: str) -> bool:
+        return (await self._client.exists(index=self.name, id=document_id)).body
+
+    async def add_document(self, document: Document, refresh: RefreshPolicy = RefreshPolicy.NONE) -> str:
+        response = await self._client.index(
+            **readiness.write_options(self._name),
+            id=document.document_id,
+            document=document.source,
+            refresh=refresh.value,
+        )
+        return response["_id"]
+
+    async def update_document(self, document: Document, refresh: RefreshPolicy = RefreshPolicy.NONE) -> Version:
+        response = await self._client.index(
+            **readiness.write_options(self._name),
+            id=document.document_id,
+            document=document.source,
+            if_seq_no=document.seq_no,
+            if_primary_term=document.primary_term,
+            refresh=refresh.value,
+        )
+        return response["_primary_term"], response["_seq_no"]
+
+    async def add_documents(self, documents: list[Document], chunk_size: int = BULK_CHUNK_SIZE,
+                            refresh: RefreshPolicy = RefreshPolicy.NONE) -> BulkResult:
+        result = BulkResult()
+
+        for start in range(0, len(documents), chunk_size):
+            chunk = documents[start:start + chunk_size]
+            last = start + chunk_size >= len(documents)
+            response = await self._client.bulk(
+                **readiness.write_options(self._name),
+                operations=bulk_operations(chunk),
+                refresh=(refresh if last else RefreshPolicy.NONE).value,
+            )
+            result.record(response["items"], start)
+
+        return result
+
+    async def get_document(self, document_id) -> Document:
+        response = await self._client.get(index=self.name, id=document_id, realtime=True)
+        return hit_to_document(response.body)
+
+    async def get_version(self, document_id: str) -> Version | None:
+        try:
+            response = await self._client.get(index=self.name, id=document_id, source=False, realtime=True)
+        except NotFoundError:
+            return None
+
+        return response["_primary_term"], response["_seq_no"]
+
+    async def get_versions(self, document_ids: list[str]) -> dict[str, Version | None]:
+        if not document_ids:
+            return {}
+
+        response = await self._client.mget(index=self.name, ids=document_ids, source=False, realtime=True)
+        return {found["_id"]: found_version(found) for found in response["docs"]}
+
+    async def get_documents(self, document_ids: list[str]) -> list[Document]:
+        if not document_ids:
+            return []
+
+        response = await self._client.mget(index=self.name, ids=document_ids, realtime=True)
+        return [hit_to_document(found) for found in response["docs"] if found.get("found")]
@@ -0,0 +1,203 @@
+from uuid import uuid4
+
+from elasticsearch import AsyncElasticsearch, ConflictError, NotFoundError
+
+from leaftracker.adapters.async_elastic_index import AsyncIndex
+from leaftracker.adapters.document_cache import DocumentCache
+from leaftracker.adapters.documents import (
+    Document, TrackedSpecies, batch_to_document, document_to_batch, document_to_source, source_to_document
+)
+from leaftracker.adapters.elastic_index import RefreshPolicy
+from leaftracker.adapters.elastic_repository import (
+    BATCH_INDEX, BATCH_MAPPINGS, SOURCE_INDEX, SOURCE_MAPPINGS, SPECIES_INDEX, SPECIES_MAPPINGS, SPECIES_SETTINGS,
+    conflict, raise_for_failures
+)
+from leaftracker.adapters.repository import BulkFailure
+from leaftracker.domain.model import Batch, Source, Species
+
+
+class AsyncSpeciesRepository:
+    def __init__(self, index_name: str = SPECIES_INDEX, client: AsyncElasticsearch | None = None,
+                 cache: DocumentCache | None = None, refresh: RefreshPolicy = RefreshPolicy.NONE):
+        self.index = AsyncIndex(index_name, SPECIES_MAPPINGS, client, SPECIES_SETTINGS)
+
+        self._refresh = refresh
+        self._cache = cache
+        self._tracked = TrackedSpecies()
+
+    def add(self, species: Species):
+        self._tracked.added.append(species)
+
+    async def get(self, reference: str) -> Species | None:
+        if reference in self._tracked.seen:
+            return self._tracked.seen[reference]
+
+        document = (await self._cached([reference])).get(reference)
+
+        if document is None:
+            try:
+                document = await self.index.get_document(reference)
+            except NotFoundError:
+                return None
+
+            self._store(document)
+
+        return self._tracked.track(document)
+
+    async def get_many(self, references: list[str]) -> list[Species]:
+        seen = self._tracked.seen
+        found = {reference: seen[reference] for reference in references if reference in seen}
+        unseen = [reference for reference in references if reference not in seen]
+        documents = await self._cached(unseen)
+
+        missing = [reference for reference in unseen if reference not in documents]
+
+        for document in await self.index.get_documents(missing):
+            self._store(document)
+            if document.document_id is not None:
+                documents[document.document_id] = document
+
+        for reference, document in documents.items():
+            found[reference] = self._tracked.track(document)
+
+        return [found[reference] for reference in references if reference in found]
+
+    async def _cached(self, references: list[str]) -> dict[str, Document]:
+        if self._cache is None:
+            return {}
+
+        found, stale = self._cache.lookup(references)
+
+        if stale:
+            versions = await self.index.get_versions(stale)
+            found.update(self._cache.revalidate({reference: versions.get(reference) for reference in stale}))
+
+        return found
+
+    def _store(self, document: Document):
+        if self._cache is not None:
+            self._cache.put(document)
+
+    def _invalidate(self, pending: list[Species]):
+        if self._cache is not None:
+            for species in pending:
+                if species.reference is not None:
+                    self._cache.invalidate(species.reference)
+
+    def added(self) -> list[Species]:
+        return self._tracked.added
+
+    async def commit(self):
+        pending = self._tracked.pending()
+        failures: list[BulkFailure] = []
+
+        if len(pending) > 1:
+            failures = await self._commit_bulk(pending)
+        else:
+            for species in pending:
+                failures = await self._commit_one(species)
+
+        self._tracked.added.clear()
+        self._invalidate(pending)
+
+        raise_for_failures(failures)
+
+    async def _commit_one(self, species: Species) -> list[BulkFailure]:
+        document = self._tracked.to_document(species)
+
+        if document.version is None:
+            species.reference = await self.index.add_document(document, self._refresh)
+            return []
+
+        try:
+            version = await self.index.update_document(document, self._refresh)
+            self._tracked.record(species, document.document_id, version)
+        except ConflictError as error:
+            return [conflict(document, error)]
+
+        return []
+
+    async def _commit_bulk(self, pending: list[Species]) -> list[BulkFailure]:
+        documents = [self._tracked.to_document(species) for species in pending]
+        result = await self.index.add_documents(documents, refresh=self._refresh)
+
+        for species, document_id, version in zip(pending, result.document_ids, result.versions):
+            self._tracked.record(species, document_id, version)
+
+        return result.failures
+
+    def rollback(self):
+        self._tracked.clear()
+
+
+class AsyncBatchRepository:
+    def __init__(self, index_name: str = BATCH_INDEX, client: AsyncElasticsearch | None = None,
+                 refresh: RefreshPolicy = RefreshPolicy.NONE):
+        self.index = AsyncIndex(index_name, BATCH_MAPPINGS, client)
+
+        self._refresh = refresh
+        self._added: list[Batch] = []
+
+    def add(self, batch: Batch) -> str:
+        if batch.reference is None:
+            batch.reference = f"batch-{uuid4().hex}"
+
+        self._added.append(batch)
+        return batch.reference
+
+    async def get(self, batch_ref: str) -> Batch | None:
+        try:
+            document = await self.index.get_document(batch_ref)
+        except NotFoundError:
+            return None
+
+        return document_to_batch(document)
+
+    def added(self) -> list[Batch]:
+        return self._added
+
+    async def commit(self):
+        if self._added:
+            result = await self.index.add_documents(
+                [batch_to_document(batch) for batch in self._added], refresh=self._refresh
+            )
+            self._added.clear()
+            raise_for_failures(result.failures)
+
+    def rollback(self):
+        self._added.clear()
+
+
+class AsyncSourceRepository:
+    def __init__(self, index_name: str = SOURCE_INDEX, client: AsyncElasticsearch | None = None,
+                 refresh: RefreshPolicy = RefreshPolicy.NONE):
+        self.index = AsyncIndex(index_name, SOURCE_MAPPINGS, client)
+
+        self._refresh = refresh
+        self._added: list[Source] = []
+
+    def add(self, source: Source) -> str:
+        self._added.append(source)
+        return source.name
+
+    async def get(self, name: str) -> Source | None:
+        try:
+            document = await self.index.get_document(name)
+        except NotFoundError:
+            return None
+
+        return document_to_source(document)
+
+    def added(self) -> list[Source]:
+        return self._added
+
+    async def commit(self):
+        if self._added:
+            result = await self.index.add_documents(
+                [source_to_document(source) for source in self._added], refresh=self._refresh
+            )
+            self._added.clear()
+            raise_for_failures(result.failures)
+
+    def rollback(self):
+        self._added.clear()
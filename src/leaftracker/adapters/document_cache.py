@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+
+from leaftracker.adapters.documents import Document, Version
+
+
+@dataclass
+class CacheEntry:
+    document: Document
+    stored_at: float
+
+    @property
+    def version(self) -> Version | None:
+        return self.document.version
+
+
+class DocumentCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+
+    def get(self, document_id: str,
+            current_version: Callable[[str], Version | None] | None = None) -> Document | None:
+        found, stale = self.lookup([document_id])
+
+        if stale:
+            version = current_version(document_id) if current_version is not None else None
+            found = self.revalidate({document_id: version})
+
+        return found.get(document_id)
+
+    def get_many(self, document_ids: list[str],
+                 current_versions: Callable[[list[str]], dict[str, Version | None]] | None = None
+                 ) -> dict[str, Document]:
+        found, stale = self.lookup(document_ids)
+
+        if stale:
+            versions = current_versions(stale) if current_versions is not None else {}
+            found.update(self.revalidate({document_id: versions.get(document_id) for document_id in stale}))
+
+        return found
+
+    def lookup(self, document_ids: list[str]) -> tuple[dict[str, Document], list[str]]:
+        found: dict[str, Document] = {}
+        stale: list[str] = []
+
+        with self._lock:
+            now = self._clock()
+
+            for document_id in document_ids:
+                entry = self._entries.get(document_id)
+                if entry is None:
+                    continue
+
+                self._entries.move_to_end(document_id)
+
+                if now - entry.stored_at < self._ttl:
+                    found[document_id] = entry.document
+                else:
+                    stale.append(document_id)
+
+        return found, stale
+
+    def revalidate(self, versions: dict[str, Version | None]) -> dict[str, Document]:
+        found: dict[str, Document] = {}
+
+        with self._lock:
+            now = self._clock()
+
+            for document_id, version in versions.items():
+                entry = self._entries.get(document_id)
+                if entry is None:
+                    continue
+
+                if version is None or version != entry.version:
+                    del self._entries[document_id]
+                else:
+                    entry.stored_at = now
+                    found[document_id] = entry.document
+
+        return found
+
+    def put(self, document: Document) -> None:
+        if document.document_id is None or document.version is None:
+            return
+
+        with self._lock:
+            cached = self._entries.get(document.document_id)
+            if cached is not None and cached.version is not None and cached.version > document.version:
+                return
+
+            self._entries[document.document_id] = CacheEntry(document, self._clock())
+            self._entries.move_to_end(document.document_id)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, document_id: str) -> None:
+        with self._lock:
+            self._entries.pop(document_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
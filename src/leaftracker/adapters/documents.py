@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+
+from leaftracker.domain.model import Batch, BatchType, Source, SourceType, Species, Stock, StockSize, TaxonName
+
+
+Version = tuple[int, int]
+
+
+@dataclass
+class Document:
+    document_id: str | None
+    source: dict
+    seq_no: int | None = None
+    primary_term: int | None = None
+
+    @property
+    def version(self) -> Version | None:
+        if self.seq_no is None or self.primary_term is None:
+            return None
+        return self.primary_term, self.seq_no
+
+
+def full_name(name: dict) -> str:
+    if "full_name" in name:
+        return name["full_name"]
+    return " ".join(name[rank] for rank in ("genus", "species", "subspecies") if rank in name)
+
+
+def document_to_species(document: Document) -> Species:
+    names = document.source["scientific_names"]
+
+    current_name = names[-1]
+    previous_names = names[:-1]
+
+    species = Species(
+        current_name=full_name(current_name),
+        reference=document.document_id
+    )
+
+    for previous_name in previous_names:
+        species.taxon_history.add_previous_name(full_name(previous_name))
+
+    return species
+
+
+def taxon_name_to_source(name: TaxonName) -> dict:
+    source = {"genus": name.genus, "species": name.species}
+
+    if name.subspecies is not None:
+        source["subspecies"] = name.subspecies
+
+    source["full_name"] = str(name)
+    return source
+
+
+def species_to_document(species: Species) -> Document:
+    scientific_names = [taxon_name_to_source(name) for name in species.taxon_history]
+
+    return Document(
+        document_id=species.reference,
+        source={
+            "scientific_names": scientific_names,
+            "current_name": str(species.taxon_history.current()),
+        }
+    )
+
+
+class TrackedSpecies:
+    def __init__(self):
+        self.added: list[Species] = []
+        self.seen: dict[str, Species] = {}
+        self.versions: dict[str, Version] = {}
+        self.snapshots: dict[str, dict] = {}
+
+    def pending(self) -> list[Species]:
+        return self.added + [species for species in self.seen.values() if self.changed(species)]
+
+    def changed(self, species: Species) -> bool:
+        if species.reference is None:
+            return True
+
+        return species_to_document(species).source != self.snapshots.get(species.reference)
+
+    def track(self, document: Document) -> Species:
+        species = document_to_species(document)
+
+        if species.reference is not None:
+            self.seen[species.reference] = species
+            self.snapshots[species.reference] = species_to_document(species).source
+
+            if document.version is not None:
+                self.versions[species.reference] = document.version
+
+        return species
+
+    def resolve(self, document: Document) -> Species:
+        if document.document_id is not None and document.document_id in self.seen:
+            return self.seen[document.document_id]
+
+        return self.track(document)
+
+    def to_document(self, species: Species) -> Document:
+        document = species_to_document(species)
+
+        if species.reference in self.versions:
+            document.primary_term, document.seq_no = self.versions[species.reference]
+
+        return document
+
+    def record(self, species: Species, document_id: str | None, version: Version | None):
+        if document_id is not None:
+            species.reference = document_id
+
+        reference = species.reference
+        if reference is None:
+            return
+
+        if version is not None:
+            self.versions[reference] = version
+
+        if reference in self.seen:
+            self.snapshots[reference] = species_to_document(species).source
+
+    def clear(self):
+        self.added.clear()
+        self.seen.clear()
+        self.versions.clear()
+        self.snapshots.clear()
+
+
+def source_to_document(source: Source) -> Document:
+    return Document(
+        document_id=source.name,
+        source={"name": source.name, "source_type": source.source_type.name}
+    )
+
+
+def document_to_source(document: Document) -> Source:
+    return Source(
+        name=document.source["name"],
+        source_type=SourceType[document.source["source_type"]]
+    )
+
+
+def batch_to_document(batch: Batch) -> Document:
+    stock = [
+        {"species_ref": line.species_ref, "quantity": line.quantity, "size": line.size.name}
+        for line in batch.stock()
+    ]
+
+    return Document(
+        document_id=batch.reference,
+        source={
+            "source": source_to_document(batch.source).source,
+            "batch_type": batch.batch_type.name,
+            "external_id": batch.external_id,
+            "stock": stock,
+        }
+    )
+
+
+def document_to_batch(document: Document) -> Batch:
+    return Batch(
+        source=document_to_source(Document(document_id=None, source=document.source["source"])),
+        batch_type=BatchType[document.source["batch_type"]],
+        reference=document.document_id,
+        external_id=document.source.get("external_id"),
+        stock=[
+            Stock(
+                species_ref=line["species_ref"],
+                quantity=line["quantity"],
+                size=StockSize[line["size"]]
+            )
+            for line in document.source["stock"]
+        ]
+    )
@@ -0,0 +1,88 @@
+import socket
+from dataclasses import dataclass
+from threading import Lock
+
+from elastic_transport import NodeConfig, Urllib3HttpNode
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+from urllib3.connection import HTTPConnection
+
+KEEP_ALIVE_SOCKET_OPTIONS = [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    hosts: str = "http://localhost:9200"
+    connections_per_node: int = 10
+    keep_alive: bool = True
+    request_timeout: float = 10.0
+    max_retries: int = 3
+    http_compress: bool = False
+
+
+class KeepAliveNode(Urllib3HttpNode):
+    def __init__(self, config: NodeConfig):
+        super().__init__(config)
+        self.pool.conn_kw["socket_options"] = KEEP_ALIVE_SOCKET_OPTIONS
+
+
+_clients: dict[ClientConfig, Elasticsearch] = {}
+_async_clients: dict[ClientConfig, AsyncElasticsearch] = {}
+_lock = Lock()
+
+
+def client_options(config: ClientConfig) -> dict:
+    return {
+        "hosts": config.hosts,
+        "connections_per_node": config.connections_per_node,
+        "request_timeout": config.request_timeout,
+        "max_retries": config.max_retries,
+        "retry_on_timeout": True,
+        "http_compress": config.http_compress,
+    }
+
+
+def create_client(config: ClientConfig) -> Elasticsearch:
+    if config.keep_alive:
+        return Elasticsearch(**client_options(config), node_class=KeepAliveNode)
+    return Elasticsearch(**client_options(config))
+
+
+def create_async_client(config: ClientConfig) -> AsyncElasticsearch:
+    return AsyncElasticsearch(**client_options(config))
+
+
+def get_client(config: ClientConfig | None = None) -> Elasticsearch:
+    config = config or ClientConfig()
+
+    with _lock:
+        if config not in _clients:
+            _clients[config] = create_client(config)
+
+        return _clients[config]
+
+
+def close_clients() -> None:
+    with _lock:
+        for client in _clients.values():
+            client.close()
+
+        _clients.clear()
+
+
+def get_async_client(config: ClientConfig | None = None) -> AsyncElasticsearch:
+    config = config or ClientConfig()
+
+    with _lock:
+        if config not in _async_clients:
+            _async_clients[config] = create_async_client(config)
+
+        return _async_clients[config]
+
+
+async def close_async_clients() -> None:
+    with _lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+
+    for client in clients:
+        await client.close()
@@ -1,74 +1,629 @@
-from dataclasses import dataclass
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import batched
+from threading import Lock
+from typing import Iterable, Iterator, Mapping
 
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, NotFoundError
+from elasticsearch.helpers import scan
+
+from leaftracker.adapters.documents import Document, Version
+from leaftracker.adapters.elastic_client import get_client
+from leaftracker.adapters.instrumentation import NULL_SINK, Measurement, Sink
+from leaftracker.adapters.repository import BulkFailure
+
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 500
+PAGE_SIZE = 1000
+TRUNCATE_THRESHOLD = 10_000
+
+
+class RefreshPolicy(Enum):
+    NONE = "false"
+    WAIT_FOR = "wait_for"
+    FORCE = "true"
+
+
+@dataclass
+class BulkResult:
+    document_ids: list[str | None] = field(default_factory=list)
+    versions: list[Version | None] = field(default_factory=list)
+    failures: list[BulkFailure] = field(default_factory=list)
+
+    def record(self, items: list[dict], start: int) -> None:
+        for position, item in enumerate(items, start=start):
+            outcome = item["index"]
+
+            if "error" in outcome:
+                self.document_ids.append(None)
+                self.versions.append(None)
+                self.failures.append(
+                    BulkFailure(
+                        position=position,
+                        document_id=outcome.get("_id"),
+                        status=outcome["status"],
+                        reason=outcome["error"].get("reason", outcome["error"]["type"]),
+                    )
+                )
+            else:
+                self.document_ids.append(outcome["_id"])
+                self.versions.append((outcome["_primary_term"], outcome["_seq_no"]))
+
+
+@dataclass
+class SearchCursor:
+    pit_id: str
+    slice: dict | None = None
+    search_after: list | None = None
+    exhausted: bool = False
+
+
+def hit_to_document(hit: Mapping) -> Document:
+    return Document(
+        document_id=hit["_id"],
+        source=hit["_source"],
+        seq_no=hit.get("_seq_no"),
+        primary_term=hit.get("_primary_term"),
+    )
+
+
+def found_version(hit: Mapping) -> Version | None:
+    if not hit.get("found"):
+        return None
+
+    return hit["_primary_term"], hit["_seq_no"]
+
+
+def bulk_operations(documents: list[Document]) -> list[dict]:
+    operations = []
+
+    for document in documents:
+        action: dict = {} if document.document_id is None else {"_id": document.document_id}
+
+        if document.version is not None:
+            action["if_seq_no"] = document.seq_no
+            action["if_primary_term"] = document.primary_term
+
+        operations.append({"index": action})
+        operations.append(document.source)
+
+    return operations
+
+
+class MigrationError(Exception):
+    def __init__(self, migration: "Migration", failures: list):
+        super().__init__(f"Reindex from {migration.source} to {migration.target} failed: {failures}")
+        self.migration = migration
+        self.failures = failures
 
 
 @dataclass
-class Document:
-    document_id: str | None
-    source: dict
+class Migration:
+    source: str
+    target: str
+    task_id: str
+    checkpoints: dict[int, int] = field(default_factory=dict)
+
+
+def write_alias(name: str) -> str:
+    return f"{name}_write"
+
+
+def versioned_name(name: str, version: int) -> str:
+    return f"{name}_v{version}"
+
+
+def index_version(index_name: str) -> int:
+    match = re.search(r"_v(\d+)$", index_name)
+    return int(match.group(1)) if match else 0
+
+
+def swap_actions(name: str, migration: Migration) -> list[dict]:
+    return [
+        {"add": {"index": migration.target, "alias": name}},
+        {"add": {"index": migration.target, "alias": write_alias(name), "is_write_index": True}},
+        {"remove_index": {"index": migration.source}},
+    ]
+
+
+def mapping_differences(live: Mapping, expected: Mapping, path: str = "") -> list[str]:
+    differences = []
+
+    for key, value in expected.items():
+        where = f"{path}.{key}" if path else key
+
+        if key not in live:
+            differences.append(f"{where} is missing")
+        elif isinstance(value, Mapping) and isinstance(live[key], Mapping):
+            differences.extend(mapping_differences(live[key], value, where))
+        elif str(live[key]).lower() != str(value).lower():
+            differences.append(f"{where} is {live[key]!r}, not {value!r}")
+
+    return differences
+
+
+def delete_operations(index: str, document_ids: list[str]) -> list[dict]:
+    return [{"delete": {"_index": index, "_id": document_id}} for document_id in document_ids]
+
+
+def shard_checkpoints(stats: Mapping, index: str) -> dict[int, int]:
+    return {
+        int(shard): copy["seq_no"]["max_seq_no"]
+        for shard, copies in stats["indices"][index]["shards"].items()
+        for copy in copies
+        if copy["routing"]["primary"]
+    }
+
+
+def changes_since(seq_no: int) -> dict:
+    return {"query": {"range": {"_seq_no": {"gt": seq_no}}}, "version": True}
+
+
+def copy_operations(index: str, hits: Iterable[Mapping]) -> list[dict]:
+    operations: list[dict] = []
+
+    for hit in hits:
+        operations.append(
+            {"index": {"_index": index, "_id": hit["_id"], "version": hit["_version"], "version_type": "external"}}
+        )
+        operations.append(hit["_source"])
+
+    return operations
+
+
+def copy_failures(items: list[dict]) -> list[dict]:
+    return [result for item in items for result in item.values() if "error" in result and result["status"] != 409]
+
+
+def reset_actions(name: str, target: str, indices: list[str]) -> list[dict]:
+    return [
+        {"add": {"index": target, "alias": name}},
+        {"add": {"index": target, "alias": write_alias(name), "is_write_index": True}},
+        *({"remove_index": {"index": index}} for index in indices),
+    ]
+
+
+@dataclass(frozen=True)
+class ReadyIndex:
+    fingerprint: str
+    write_target: str
+
+
+class ReadinessRegistry:
+    def __init__(self):
+        self._ready: dict[str, ReadyIndex] = {}
+        self._lock = Lock()
+
+    def is_ready(self, name: str, mappings: dict, settings: dict | None = None) -> bool:
+        with self._lock:
+            ready = self._ready.get(name)
+            return ready is not None and ready.fingerprint == fingerprint(mappings, settings)
+
+    def mark_ready(self, name: str, mappings: dict, settings: dict | None = None,
+                   write_target: str | None = None) -> None:
+        with self._lock:
+            self._ready[name] = ReadyIndex(fingerprint(mappings, settings), write_target or write_alias(name))
+
+    def write_options(self, name: str) -> dict:
+        with self._lock:
+            ready = self._ready.get(name)
+
+        if ready is None or ready.write_target != name:
+            return {"index": write_alias(name), "require_alias": True}
+        return {"index": name}
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            self._ready.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ready.clear()
+
+
+def fingerprint(mappings: dict, settings: dict | None = None) -> str:
+    return json.dumps({"mappings": mappings, "settings": settings or {}}, sort_keys=True)
+
+
+readiness = ReadinessRegistry()
 
 
 class Lifecycle:
-    def __init__(self, name: str, mappings: dict):
-        self._client = Elasticsearch(hosts="http://localhost:9200")
+    def __init__(self, name: str, mappings: dict, client: Elasticsearch | None = None,
+                 settings: dict | None = None, sink: Sink = NULL_SINK):
+        self._client = client or get_client()
         self._name = name
         self._mappings = mappings
+        self._settings = settings
+        self._sink = sink
+
+    @property
+    def write_alias(self) -> str:
+        return write_alias(self._name)
 
     def create(self):
-        if self.exists():
+        if readiness.is_ready(self._name, self._mappings, self._settings):
             return
 
-        self._client.indices.create(index=self._name, mappings=self._mappings)
+        with Measurement(self._sink, "lifecycle.create", self._name):
+            if not self.exists():
+                self._client.indices.create(
+                    index=versioned_name(self._name, 1),
+                    mappings=self._mappings,
+                    settings=self._settings,
+                    aliases={self._name: {}, self.write_alias: {"is_write_index": True}},
+                )
+                readiness.mark_ready(self._name, self._mappings, self._settings)
+                return
+
+            aliased = self.has_write_alias()
+            differences = mapping_differences(self.live_mappings(), self._mappings)
+
+            if not aliased:
+                differences.append(f"{self.write_alias} is missing")
+            if differences:
+                logger.warning("Index %s needs a migration: %s", self._name, ", ".join(differences))
+
+            readiness.mark_ready(self._name, self._mappings, self._settings,
+                                 write_target=self.write_alias if aliased else self._name)
+
+    def upgrade(self) -> Migration | None:
+        if not self.exists():
+            self.create()
+            return None
+
+        if self.has_write_alias() and not mapping_differences(self.live_mappings(), self._mappings):
+            readiness.mark_ready(self._name, self._mappings, self._settings)
+            return None
+
+        return self.migrate(self._mappings, self._settings)
 
     def delete(self) -> None:
-        self._client.options(ignore_status=404).indices.delete(index=self._name)
+        with Measurement(self._sink, "lifecycle.delete", self._name):
+            readiness.invalidate(self._name)
+            indices = self.backing_indices()
+
+            if indices:
+                self._client.options(ignore_status=404).indices.delete(index=indices)
 
     def exists(self) -> bool:
         return self._client.indices.exists(index=self._name).body
 
+    def has_write_alias(self) -> bool:
+        return self._client.indices.exists_alias(name=self.write_alias).body
+
+    def live_mappings(self) -> dict:
+        response = self._client.indices.get_mapping(index=self._name)
+        return next(iter(response.body.values()))["mappings"]
+
+    def reset(self) -> None:
+        indices = self.backing_indices()
+
+        if not indices:
+            self.create()
+            return
+
+        with Measurement(self._sink, "lifecycle.reset", self._name):
+            target = versioned_name(self._name, max(index_version(index) for index in indices) + 1)
+
+            self._client.indices.create(index=target, mappings=self._mappings, settings=self._settings)
+            self._client.indices.update_aliases(actions=reset_actions(self._name, target, indices))
+            readiness.mark_ready(self._name, self._mappings, self._settings)
+
+    def current_index(self) -> str:
+        return next(iter(self._client.indices.get_alias(index=self._name).body))
+
+    def backing_indices(self) -> list[str]:
+        response = self._client.options(ignore_status=404).indices.get_alias(
+            index=[self._name, self.write_alias], ignore_unavailable=True
+        )
+        if response.meta.status == 404:
+            return []
+        return sorted(response.body)
+
+    def migrate(self, mappings: dict, settings: dict | None = None, wait: bool = True,
+                slices: int | str = "auto", requests_per_second: float | None = None) -> Migration:
+        with Measurement(self._sink, "lifecycle.migrate", self._name, body=mappings):
+            source = self.current_index()
+            target = versioned_name(self._name, index_version(source) + 1)
+
+            self._client.indices.create(index=target, mappings=mappings, settings=settings)
+            checkpoints = self._checkpoints(source)
+
+            self._mappings = mappings
+            self._settings = settings
+
+            response = self._client.reindex(
+                source={"index": source},
+                dest={"index": target, "version_type": "external"},
+                conflicts="proceed",
+                slices=slices,
+                requests_per_second=requests_per_second,
+                wait_for_completion=False,
+            )
+            migration = Migration(source=source, target=target, task_id=response["task"], checkpoints=checkpoints)
+
+        if wait:
+            self.complete(migration)
+
+        return migration
+
+    def complete(self, migration: Migration, timeout: str = "30m") -> None:
+        with Measurement(self._sink, "lifecycle.complete", self._name) as measured:
+            response = self._client.tasks.get(task_id=migration.task_id, wait_for_completion=True, timeout=timeout)
+
+            if "error" in response:
+                raise MigrationError(migration, [response["error"]])
+
+            failures = response["response"].get("failures", [])
+            if failures:
+                raise MigrationError(migration, failures)
+
+            measured.documents = response["response"].get("created", 0) + self._catch_up(migration)
+            self._client.indices.add_block(index=migration.source, block="write")
+
+            try:
+                measured.documents += self._catch_up(migration)
+                self._client.indices.update_aliases(actions=swap_actions(self._name, migration))
+            except Exception:
+                self._client.indices.put_settings(index=migration.source, settings={"index.blocks.write": False})
+                raise
+
+            readiness.mark_ready(self._name, self._mappings, self._settings)
+
+    def _checkpoints(self, index: str) -> dict[int, int]:
+        return shard_checkpoints(self._client.indices.stats(index=index, level="shards").body, index)
+
+    def _catch_up(self, migration: Migration) -> int:
+        copied = self._copy_changes(migration)
+        self._remove_deleted(migration)
+        return copied
+
+    def _copy_changes(self, migration: Migration) -> int:
+        checkpoints = self._checkpoints(migration.source)
+        copied = 0
+
+        self._client.indices.refresh(index=migration.source)
+
+        for shard, seq_no in migration.checkpoints.items():
+            if checkpoints.get(shard, seq_no) <= seq_no:
+                continue
+
+            hits = scan(self._client, index=migration.source, query=changes_since(seq_no), preference=f"_shards:{shard}")
+
+            for chunk in batched(hits, BULK_CHUNK_SIZE):
+                response = self._client.bulk(operations=copy_operations(migration.target, chunk))
+                failures = copy_failures(response["items"])
+
+                if failures:
+                    raise MigrationError(migration, failures)
+
+                copied += len(chunk)
+
+        migration.checkpoints = checkpoints
+        return copied
+
+    def _remove_deleted(self, migration: Migration) -> None:
+        self._client.indices.refresh(index=[migration.source, migration.target])
+
+        if self._client.count(index=migration.source)["count"] == self._client.count(index=migration.target)["count"]:
+            return
+
+        for chunk in batched(self._deleted_since_copy(migration), BULK_CHUNK_SIZE):
+            self._client.bulk(operations=delete_operations(migration.target, list(chunk)), refresh=True)
+
+    def _deleted_since_copy(self, migration: Migration) -> list[str]:
+        copied = [hit["_id"] for hit in scan(self._client, index=migration.target, query={"_source": False})]
+        deleted: list[str] = []
+
+        for chunk in batched(copied, BULK_CHUNK_SIZE):
+            response = self._client.mget(index=migration.source, ids=list(chunk))
+            deleted.extend(document["_id"] for document in response["docs"] if not document["found"])
+
+        return deleted
+
 
 class Index:
-    def __init__(self, name: str, mappings: dict):
-        self._client = Elasticsearch(hosts="http://localhost:9200")
+    def __init__(self, name: str, mappings: dict, client: Elasticsearch | None = None,
+                 settings: dict | None = None, sink: Sink = NULL_SINK):
+        self._client = client or get_client()
         self._name = name
         self._mappings = mappings
+        self._sink = sink
 
-        self.lifecycle = Lifecycle(name, mappings)
+        self.lifecycle = Lifecycle(name, mappings, self._client, settings, sink)
 
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def client(self) -> Elasticsearch:
+        return self._client
+
     def refresh(self) -> None:
-        self._client.indices.refresh(index=self._name)
+        with Measurement(self._sink, "index.refresh", self._name):
+            self._client.indices.refresh(index=[self._name, write_alias(self._name)], ignore_unavailable=True)
 
     def document_count(self) -> int:
-        return self._client.count(index=self._name)["count"]
-
-    def delete_all_documents(self) -> None:
-        self._client.delete_by_query(
-            index=self._name,
-            body={
-                "query": {"match_all": {}}
-            }
-        )
-        self.refresh()
+        with Measurement(self._sink, "index.count", self._name):
+            return self._client.count(index=self._name)["count"]
+
+    def delete_all_documents(self, truncate: bool | None = None) -> None:
+        if truncate is None:
+            truncate = self.document_count() >= TRUNCATE_THRESHOLD
+
+        if truncate:
+            self.lifecycle.reset()
+            return
+
+        with Measurement(self._sink, "index.delete_by_query", self._name) as measured:
+            response = self._client.delete_by_query(
+                index=self._name,
+                body={
+                    "query": {"match_all": {}}
+                },
+                refresh=True,
+            )
+            measured.documents = response["deleted"]
+
+    def aggregate(self, aggregations: dict, query: dict | None = None) -> dict:
+        with Measurement(self._sink, "index.aggregate", self._name, body=aggregations):
+            response = self._client.search(
+                index=self._name,
+                size=0,
+                query=query or {"match_all": {}},
+                aggs=aggregations,
+            )
+
+        return response["aggregations"]
+
+    def search(self, query: dict, size: int = 10) -> list[Document]:
+        with Measurement(self._sink, "index.search", self._name, body=query) as measured:
+            response = self._client.search(
+                index=self._name,
+                query=query,
+                size=size,
+                seq_no_primary_term=True,
+            )
+            hits = response["hits"]["hits"]
+            measured.documents = len(hits)
+
+        return [hit_to_document(hit) for hit in hits]
 
     def document_exists(self, document_id: str) -> bool:
-        return self._client.exists(index=self.name, id=document_id).body
+        with Measurement(self._sink, "index.exists", self._name) as measured:
+            exists = self._client.exists(index=self.name, id=document_id).body
+            measured.documents = int(exists)
+
+        return exists
+
+    def add_document(self, document: Document, refresh: RefreshPolicy = RefreshPolicy.NONE) -> str:
+        with Measurement(self._sink, "index.index", self._name, documents=1, body=document.source):
+            response = self._client.index(
+                **readiness.write_options(self._name),
+                id=document.document_id,
+                document=document.source,
+                refresh=refresh.value,
+            )
 
-    def add_document(self, document: Document) -> str:
-        response = self._client.index(
-            index=self.name,
-            id=document.document_id,
-            document=document.source
-        )
         return response["_id"]
 
+    def update_document(self, document: Document, refresh: RefreshPolicy = RefreshPolicy.NONE) -> Version:
+        with Measurement(self._sink, "index.index", self._name, documents=1, body=document.source):
+            response = self._client.index(
+                **readiness.write_options(self._name),
+                id=document.document_id,
+                document=document.source,
+                if_seq_no=document.seq_no,
+                if_primary_term=document.primary_term,
+                refresh=refresh.value,
+            )
+
+        return response["_primary_term"], response["_seq_no"]
+
+    def add_documents(self, documents: list[Document], chunk_size: int = BULK_CHUNK_SIZE,
+                      refresh: RefreshPolicy = RefreshPolicy.NONE) -> BulkResult:
+        result = BulkResult()
+
+        for start in range(0, len(documents), chunk_size):
+            chunk = documents[start:start + chunk_size]
+            last = start + chunk_size >= len(documents)
+            operations = bulk_operations(chunk)
+
+            with Measurement(self._sink, "index.bulk", self._name, documents=len(chunk), body=operations):
+                response = self._client.bulk(
+                    **readiness.write_options(self._name),
+                    operations=operations,
+                    refresh=(refresh if last else RefreshPolicy.NONE).value,
+                )
+
+            result.record(response["items"], start)
+
+        return result
+
     def get_document(self, document_id) -> Document:
-        response = self._client.get(index=self.name, id=document_id)
-        return Document(
-            document_id=response["_id"],
-            source=response["_source"],
-        )
+        with Measurement(self._sink, "index.get", self._name, documents=1):
+            response = self._client.get(index=self.name, id=document_id, realtime=True)
+
+        return hit_to_document(response.body)
+
+    def get_version(self, document_id: str) -> Version | None:
+        try:
+            with Measurement(self._sink, "index.get_version", self._name, documents=1):
+                response = self._client.get(index=self.name, id=document_id, source=False, realtime=True)
+        except NotFoundError:
+            return None
+
+        return response["_primary_term"], response["_seq_no"]
+
+    def get_versions(self, document_ids: list[str]) -> dict[str, Version | None]:
+        if not document_ids:
+            return {}
+
+        with Measurement(self._sink, "index.get_versions", self._name, documents=len(document_ids)):
+            response = self._client.mget(index=self.name, ids=document_ids, source=False, realtime=True)
+
+        return {found["_id"]: found_version(found) for found in response["docs"]}
+
+    def get_documents(self, document_ids: list[str]) -> list[Document]:
+        if not document_ids:
+            return []
+
+        with Measurement(self._sink, "index.mget", self._name, documents=len(document_ids)):
+            response = self._client.mget(index=self.name, ids=document_ids, realtime=True)
+
+        return [hit_to_document(found) for found in response["docs"] if found.get("found")]
+
+    def iter_documents(self, page_size: int = PAGE_SIZE, slices: int = 1,
+                       keep_alive: str = "1m") -> Iterator[Document]:
+        pit_id = self._client.open_point_in_time(index=self.name, keep_alive=keep_alive)["id"]
+
+        try:
+            if slices > 1:
+                yield from self._iter_slices(pit_id, page_size, slices, keep_alive)
+            else:
+                cursor = SearchCursor(pit_id)
+                while not cursor.exhausted:
+                    yield from self._next_page(cursor, page_size, keep_alive)
+        finally:
+            self._client.close_point_in_time(id=pit_id)
+
+    def _iter_slices(self, pit_id: str, page_size: int, slices: int, keep_alive: str) -> Iterator[Document]:
+        cursors = [SearchCursor(pit_id, slice={"id": slice_id, "max": slices}) for slice_id in range(slices)]
+
+        with ThreadPoolExecutor(max_workers=slices) as executor:
+            while cursors:
+                pages = [executor.submit(self._next_page, cursor, page_size, keep_alive) for cursor in cursors]
+
+                for page in pages:
+                    yield from page.result()
+
+                cursors = [cursor for cursor in cursors if not cursor.exhausted]
+
+    def _next_page(self, cursor: SearchCursor, page_size: int, keep_alive: str) -> list[Document]:
+        with Measurement(self._sink, "index.search_page", self._name) as measured:
+            response = self._client.search(
+                pit={"id": cursor.pit_id, "keep_alive": keep_alive},
+                size=page_size,
+                sort=["_shard_doc"],
+                search_after=cursor.search_after,
+                slice=cursor.slice,
+                seq_no_primary_term=True,
+            )
+            hits = response["hits"]["hits"]
+            measured.documents = len(hits)
+
+        cursor.pit_id = response.get("pit_id", cursor.pit_id)
+        cursor.exhausted = len(hits) < page_size
+
+        if hits:
+            cursor.search_after = hits[-1]["sort"]
+
+        return [hit_to_document(hit) for hit in hits]
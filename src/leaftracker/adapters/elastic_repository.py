@@ -1,81 +1,383 @@
-from elasticsearch import NotFoundError
+from typing import Iterator
+from uuid import uuid4
 
-from leaftracker.adapters.elastic_index import Document, Index
-from leaftracker.domain.model import Species
+from elasticsearch import ConflictError, Elasticsearch, NotFoundError
+
+from leaftracker.adapters.document_cache import DocumentCache
+from leaftracker.adapters.documents import (
+    Document, TrackedSpecies, batch_to_document, document_to_batch, document_to_source, document_to_species,
+    source_to_document
+)
+from leaftracker.adapters.elastic_index import Index, PAGE_SIZE, RefreshPolicy
+from leaftracker.adapters.instrumentation import NULL_SINK, Sink
+from leaftracker.adapters.repository import BulkFailure, BulkWriteError, ConcurrentModification
+from leaftracker.domain.model import Batch, BatchType, Source, Species, StockSize
 
 SPECIES_INDEX = "species"
 
+SPECIES_SETTINGS = {
+    "analysis": {
+        "normalizer": {
+            "name_normaliser": {"type": "custom", "filter": ["lowercase", "asciifolding"]}
+        },
+        "tokenizer": {
+            "name_prefix": {
+                "type": "edge_ngram",
+                "min_gram": 1,
+                "max_gram": 20,
+                "token_chars": ["letter", "digit"],
+            }
+        },
+        "analyzer": {
+            "name_prefix": {
+                "type": "custom",
+                "tokenizer": "name_prefix",
+                "filter": ["lowercase", "asciifolding"],
+            },
+            "name_search": {
+                "type": "custom",
+                "tokenizer": "standard",
+                "filter": ["lowercase", "asciifolding"],
+            },
+        },
+    }
+}
+
+
+def name_field() -> dict:
+    return {
+        "type": "text",
+        "fields": {
+            "keyword": {"type": "keyword"},
+            "normalised": {"type": "keyword", "normalizer": "name_normaliser"},
+            "prefix": {"type": "text", "analyzer": "name_prefix", "search_analyzer": "name_search"},
+        }
+    }
+
+
 SPECIES_MAPPINGS = {
     "properties": {
         "scientific_names": {
             "properties": {
-                "genus": {"type": "text"},
-                "species": {"type": "text"},
+                "genus": name_field(),
+                "species": name_field(),
+                "subspecies": name_field(),
+                "full_name": name_field(),
+            }
+        },
+        "current_name": name_field(),
+    }
+}
+
+BATCH_INDEX = "batches"
+
+BATCH_MAPPINGS = {
+    "properties": {
+        "source": {
+            "properties": {
+                "name": {"type": "keyword"},
+                "source_type": {"type": "keyword"},
+            }
+        },
+        "batch_type": {"type": "keyword"},
+        "external_id": {"type": "keyword"},
+        "stock": {
+            "type": "nested",
+            "properties": {
+                "species_ref": {"type": "keyword"},
+                "quantity": {"type": "integer"},
+                "size": {"type": "keyword"},
             }
         }
     }
 }
 
+SOURCE_INDEX = "sources"
+
+SOURCE_MAPPINGS = {
+    "properties": {
+        "name": {"type": "keyword"},
+        "source_type": {"type": "keyword"},
+    }
+}
 
-def document_to_species(document: Document) -> Species:
-    names = document.source["scientific_names"]
 
-    current_name = names[-1]
-    previous_names = names[:-1]
+def name_query(name: str, include_previous: bool = True, prefix: bool = False) -> dict:
+    field = "scientific_names.full_name" if include_previous else "current_name"
+    name = " ".join(name.split())
 
-    species = Species(
-        current_name=f"{current_name["genus"]} {current_name["species"]}",
-        reference=document.document_id
-    )
+    clause: dict
+    if prefix:
+        clause = {"match": {f"{field}.prefix": {"query": name, "operator": "and"}}}
+    else:
+        clause = {"term": {f"{field}.normalised": name}}
 
-    for previous_name in previous_names:
-        species.taxon_history.add_previous_name(
-            f"{previous_name["genus"]} {previous_name["species"]}"
-        )
+    return {"bool": {"filter": [clause]}}
 
-    return species
 
+def raise_for_failures(failures: list[BulkFailure]):
+    conflicts = [str(failure.document_id) for failure in failures if failure.status == 409]
 
-def species_to_document(species: Species) -> Document:
-    scientific_names = [
-        {"genus": name.genus, "species": name.species}
-        for name in species.taxon_history
-    ]
+    if conflicts:
+        raise ConcurrentModification(conflicts)
 
-    return Document(
-        document_id=species.reference,
-        source={"scientific_names": scientific_names}
-    )
+    if failures:
+        raise BulkWriteError(failures)
+
+
+def conflict(document: Document, error: Exception) -> BulkFailure:
+    return BulkFailure(position=0, document_id=document.document_id, status=409, reason=str(error))
 
 
 class SpeciesRepository:
-    def __init__(self, index_name: str = SPECIES_INDEX):
-        self.index = Index(index_name, SPECIES_MAPPINGS)
+    def __init__(self, index_name: str = SPECIES_INDEX, client: Elasticsearch | None = None,
+                 cache: DocumentCache | None = None, refresh: RefreshPolicy = RefreshPolicy.NONE,
+                 sink: Sink = NULL_SINK):
+        self.index = Index(index_name, SPECIES_MAPPINGS, client, SPECIES_SETTINGS, sink)
         self.index.lifecycle.create()
 
-        self._added: list[Species] = []
+        self._refresh = refresh
+        self._cache = cache
+        self._tracked = TrackedSpecies()
 
     def add(self, species: Species):
-        self._added.append(species)
+        self._tracked.added.append(species)
 
     def get(self, reference: str) -> Species | None:
+        if reference in self._tracked.seen:
+            return self._tracked.seen[reference]
+
+        document = self._cache.get(reference, self.index.get_version) if self._cache is not None else None
+
+        if document is None:
+            try:
+                document = self.index.get_document(reference)
+            except NotFoundError:
+                return None
+
+            self._store(document)
+
+        return self._tracked.track(document)
+
+    def get_many(self, references: list[str]) -> list[Species]:
+        seen = self._tracked.seen
+        found = {reference: seen[reference] for reference in references if reference in seen}
+        unseen = [reference for reference in references if reference not in seen]
+        documents = self._cache.get_many(unseen, self.index.get_versions) if self._cache is not None else {}
+
+        missing = [reference for reference in unseen if reference not in documents]
+
+        for document in self.index.get_documents(missing):
+            self._store(document)
+            if document.document_id is not None:
+                documents[document.document_id] = document
+
+        for reference, document in documents.items():
+            found[reference] = self._tracked.track(document)
+
+        return [found[reference] for reference in references if reference in found]
+
+    def iter_all(self, page_size: int = PAGE_SIZE, slices: int = 1) -> Iterator[Species]:
+        for document in self.index.iter_documents(page_size=page_size, slices=slices):
+            yield document_to_species(document)
+
+    def find_by_name(self, name: str, include_previous: bool = True, prefix: bool = False,
+                     limit: int = 10) -> list[Species]:
+        documents = self.index.search(name_query(name, include_previous, prefix), size=limit)
+
+        return [self._tracked.resolve(document) for document in documents]
+
+    def _store(self, document: Document):
+        if self._cache is not None:
+            self._cache.put(document)
+
+    def _invalidate(self, pending: list[Species]):
+        if self._cache is not None:
+            for species in pending:
+                if species.reference is not None:
+                    self._cache.invalidate(species.reference)
+
+    def added(self) -> list[Species]:
+        return self._tracked.added
+
+    def pending(self) -> list[Species]:
+        return self._tracked.pending()
+
+    def commit(self):
+        pending = self._tracked.pending()
+        failures: list[BulkFailure] = []
+
+        if len(pending) > 1:
+            failures = self._commit_bulk(pending)
+        else:
+            for species in pending:
+                failures = self._commit_one(species)
+
+        self._tracked.added.clear()
+        self._invalidate(pending)
+
+        raise_for_failures(failures)
+
+    def _commit_one(self, species: Species) -> list[BulkFailure]:
+        document = self._tracked.to_document(species)
+
+        if document.version is None:
+            species.reference = self.index.add_document(document, self._refresh)
+            return []
+
+        try:
+            version = self.index.update_document(document, self._refresh)
+            self._tracked.record(species, document.document_id, version)
+        except ConflictError as error:
+            return [conflict(document, error)]
+
+        return []
+
+    def _commit_bulk(self, pending: list[Species]) -> list[BulkFailure]:
+        documents = [self._tracked.to_document(species) for species in pending]
+        result = self.index.add_documents(documents, refresh=self._refresh)
+
+        for species, document_id, version in zip(pending, result.document_ids, result.versions):
+            self._tracked.record(species, document_id, version)
+
+        return result.failures
+
+    def rollback(self):
+        self._tracked.clear()
+
+
+def stock_filter(species_ref: str | None = None, size: StockSize | None = None) -> list[dict]:
+    filters = []
+
+    if species_ref is not None:
+        filters.append({"term": {"stock.species_ref": species_ref}})
+
+    if size is not None:
+        filters.append({"term": {"stock.size": size.name}})
+
+    return filters
+
+
+def batch_type_query(batch_type: BatchType | None) -> dict | None:
+    if batch_type is None:
+        return None
+    return {"bool": {"filter": [{"term": {"batch_type": batch_type.name}}]}}
+
+
+class BatchRepository:
+    def __init__(self, index_name: str = BATCH_INDEX, client: Elasticsearch | None = None,
+                 refresh: RefreshPolicy = RefreshPolicy.NONE, sink: Sink = NULL_SINK):
+        self.index = Index(index_name, BATCH_MAPPINGS, client, sink=sink)
+        self.index.lifecycle.create()
+
+        self._refresh = refresh
+        self._added: list[Batch] = []
+
+    def add(self, batch: Batch) -> str:
+        if batch.reference is None:
+            batch.reference = f"batch-{uuid4().hex}"
+
+        self._added.append(batch)
+        return batch.reference
+
+    def get(self, batch_ref: str) -> Batch | None:
         try:
-            document = self.index.get_document(reference)
+            document = self.index.get_document(batch_ref)
         except NotFoundError:
             return None
 
-        return document_to_species(document)
+        return document_to_batch(document)
 
-    def added(self) -> list[Species]:
+    def quantity(self, species_ref: str, size: StockSize | None = None,
+                 batch_type: BatchType | None = None) -> int:
+        aggregations = self.index.aggregate(
+            aggregations={
+                "stock": {
+                    "nested": {"path": "stock"},
+                    "aggs": {
+                        "matching": {
+                            "filter": {"bool": {"filter": stock_filter(species_ref, size)}},
+                            "aggs": {"quantity": {"sum": {"field": "stock.quantity"}}}
+                        }
+                    }
+                }
+            },
+            query=batch_type_query(batch_type)
+        )
+        return int(aggregations["stock"]["matching"]["quantity"]["value"])
+
+    def quantities(self, size: StockSize | None = None, batch_type: BatchType | None = None,
+                   max_species: int = 10_000) -> dict[str, int]:
+        aggregations = self.index.aggregate(
+            aggregations={
+                "stock": {
+                    "nested": {"path": "stock"},
+                    "aggs": {
+                        "matching": {
+                            "filter": {"bool": {"filter": stock_filter(size=size)}},
+                            "aggs": {
+                                "species": {
+                                    "terms": {"field": "stock.species_ref", "size": max_species},
+                                    "aggs": {"quantity": {"sum": {"field": "stock.quantity"}}}
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            query=batch_type_query(batch_type)
+        )
+        return {
+            bucket["key"]: int(bucket["quantity"]["value"])
+            for bucket in aggregations["stock"]["matching"]["species"]["buckets"]
+        }
+
+    def added(self) -> list[Batch]:
         return self._added
 
     def commit(self):
-        for species in self.added():
-            document = species_to_document(species)
-            species.reference = self.index.add_document(document)
+        if self._added:
+            result = self.index.add_documents(
+                [batch_to_document(batch) for batch in self._added], refresh=self._refresh
+            )
+            self._added.clear()
+            raise_for_failures(result.failures)
 
-        self.index.refresh()
+    def rollback(self):
         self._added.clear()
 
+
+class SourceRepository:
+    def __init__(self, index_name: str = SOURCE_INDEX, client: Elasticsearch | None = None,
+                 refresh: RefreshPolicy = RefreshPolicy.NONE, sink: Sink = NULL_SINK):
+        self.index = Index(index_name, SOURCE_MAPPINGS, client, sink=sink)
+        self.index.lifecycle.create()
+
+        self._refresh = refresh
+        self._added: list[Source] = []
+
+    def add(self, source: Source) -> str:
+        self._added.append(source)
+        return source.name
+
+    def get(self, name: str) -> Source | None:
+        try:
+            document = self.index.get_document(name)
+        except NotFoundError:
+            return None
+
+        return document_to_source(document)
+
+    def added(self) -> list[Source]:
+        return self._added
+
+    def commit(self):
+        if self._added:
+            result = self.index.add_documents(
+                [source_to_document(source) for source in self._added], refresh=self._refresh
+            )
+            self._added.clear()
+            raise_for_failures(result.failures)
+
     def rollback(self):
         self._added.clear()
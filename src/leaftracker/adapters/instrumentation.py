@@ -0,0 +1,128 @@
+import json
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from types import TracebackType
+from typing import Protocol
+
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    index: str
+    documents: int = 0
+    bytes: int = 0
+    duration: float = 0.0
+
+
+class Sink(Protocol):
+    enabled: bool
+    measures_payload: bool
+
+    def record(self, event: Event) -> None: ...
+
+
+class NullSink:
+    enabled = False
+    measures_payload = False
+
+    def record(self, event: Event) -> None:
+        pass
+
+
+NULL_SINK = NullSink()
+
+
+class EventLog:
+    enabled = True
+    measures_payload = True
+
+    def __init__(self):
+        self.events: list[Event] = []
+
+    def record(self, event: Event) -> None:
+        self.events.append(event)
+
+    def named(self, name: str) -> list[Event]:
+        return [event for event in self.events if event.name == name]
+
+
+@dataclass
+class OperationTotals:
+    calls: int = 0
+    documents: int = 0
+    bytes: int = 0
+    duration: float = 0.0
+
+    def add(self, event: Event) -> None:
+        self.calls += 1
+        self.documents += event.documents
+        self.bytes += event.bytes
+        self.duration += event.duration
+
+
+class Summary:
+    def __init__(self, forward: Sink | None = None):
+        self.enabled = True
+        self.measures_payload = forward is None or forward.measures_payload
+        self._forward = forward if forward is not None and forward.enabled else None
+        self._operations: dict[str, OperationTotals] = {}
+        self._lock = Lock()
+
+    def record(self, event: Event) -> None:
+        with self._lock:
+            self._operations.setdefault(event.name, OperationTotals()).add(event)
+
+        if self._forward is not None:
+            self._forward.record(event)
+
+    def totals(self) -> dict[str, OperationTotals]:
+        with self._lock:
+            return {
+                name: OperationTotals(totals.calls, totals.documents, totals.bytes, totals.duration)
+                for name, totals in self._operations.items()
+            }
+
+    def calls(self) -> int:
+        with self._lock:
+            return sum(totals.calls for totals in self._operations.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+
+def payload_size(body: object) -> int:
+    if body is None:
+        return 0
+
+    if isinstance(body, list):
+        return sum(payload_size(line) + 1 for line in body)
+
+    return len(json.dumps(body, default=str).encode())
+
+
+def emit(sink: Sink, name: str, index: str, started: float, documents: int = 0, body: object = None) -> None:
+    size = payload_size(body) if sink.measures_payload else 0
+    sink.record(Event(name, index, documents, size, perf_counter() - started))
+
+
+class Measurement:
+    __slots__ = ("_sink", "_name", "_index", "_started", "documents", "body")
+
+    def __init__(self, sink: Sink, name: str, index: str, documents: int = 0, body: object = None):
+        self._sink = sink
+        self._name = name
+        self._index = index
+        self._started = 0.0
+        self.documents = documents
+        self.body = body
+
+    def __enter__(self) -> "Measurement":
+        self._started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        if self._sink.enabled:
+            emit(self._sink, self._name, self._index, self._started, self.documents, self.body)
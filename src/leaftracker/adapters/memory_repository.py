@@ -0,0 +1,197 @@
+from itertools import count
+from threading import RLock
+from typing import Iterator
+
+from leaftracker.adapters.documents import (
+    Document, TrackedSpecies, batch_to_document, document_to_batch, document_to_source, document_to_species,
+    full_name, source_to_document, species_to_document
+)
+from leaftracker.adapters.repository import ConcurrentModification
+from leaftracker.domain.model import Batch, Source, Species
+
+PRIMARY_TERM = 1
+
+
+class MemoryStore:
+    def __init__(self):
+        self.species: dict[str, Document] = {}
+        self.batches: dict[str, Document] = {}
+        self.sources: dict[str, Document] = {}
+        self.lock = RLock()
+
+        self._seq_no = count(start=1)
+        self._references: dict[str, Iterator[int]] = {}
+
+    def next_seq_no(self) -> int:
+        return next(self._seq_no)
+
+    def next_reference(self, prefix: str) -> str:
+        numbers = self._references.setdefault(prefix, count(start=1))
+        return f"{prefix}-{next(numbers):04}"
+
+
+def stored(document: Document, seq_no: int) -> Document:
+    return Document(
+        document_id=document.document_id,
+        source=document.source,
+        seq_no=seq_no,
+        primary_term=PRIMARY_TERM,
+    )
+
+
+def names_of(document: Document, include_previous: bool) -> list[str]:
+    names = document.source["scientific_names"]
+
+    if not include_previous:
+        names = names[-1:]
+
+    return [full_name(name).lower() for name in names]
+
+
+class MemorySpeciesRepository:
+    def __init__(self, store: MemoryStore):
+        self._store = store
+        self._tracked = TrackedSpecies()
+
+    def add(self, species: Species):
+        self._tracked.added.append(species)
+
+    def get(self, reference: str) -> Species | None:
+        if reference in self._tracked.seen:
+            return self._tracked.seen[reference]
+
+        document = self._store.species.get(reference)
+
+        if document is None:
+            return None
+
+        return self._tracked.track(document)
+
+    def get_many(self, references: list[str]) -> list[Species]:
+        found = (self.get(reference) for reference in references)
+        return [species for species in found if species is not None]
+
+    def iter_all(self) -> Iterator[Species]:
+        with self._store.lock:
+            documents = list(self._store.species.values())
+
+        for document in documents:
+            yield document_to_species(document)
+
+    def find_by_name(self, name: str, include_previous: bool = True, prefix: bool = False) -> list[Species]:
+        name = " ".join(name.split()).lower()
+
+        with self._store.lock:
+            documents = [
+                document for document in self._store.species.values()
+                if any(text.startswith(name) if prefix else text == name
+                       for text in names_of(document, include_previous))
+            ]
+
+        return [self._tracked.resolve(document) for document in documents]
+
+    def added(self) -> list[Species]:
+        return self._tracked.added
+
+    def pending(self) -> list[Species]:
+        return self._tracked.pending()
+
+    def check(self):
+        conflicts = []
+
+        for species in self._tracked.pending():
+            reference = species.reference
+            if reference is None or reference not in self._tracked.versions:
+                continue
+
+            current = self._store.species.get(reference)
+            if current is None or current.version != self._tracked.versions[reference]:
+                conflicts.append(reference)
+
+        if conflicts:
+            raise ConcurrentModification(conflicts)
+
+    def commit(self):
+        with self._store.lock:
+            self.check()
+
+            for species in self._tracked.pending():
+                if species.reference is None:
+                    species.reference = self._store.next_reference("species")
+
+                document = stored(species_to_document(species), self._store.next_seq_no())
+                self._store.species[species.reference] = document
+                self._tracked.record(species, None, document.version)
+
+        self._tracked.added.clear()
+
+    def rollback(self):
+        self._tracked.clear()
+
+
+class MemoryBatchRepository:
+    def __init__(self, store: MemoryStore):
+        self._store = store
+        self._added: list[Batch] = []
+
+    def add(self, batch: Batch) -> str:
+        if batch.reference is None:
+            batch.reference = self._store.next_reference("batch")
+
+        self._added.append(batch)
+        return batch.reference
+
+    def get(self, batch_ref: str) -> Batch | None:
+        document = self._store.batches.get(batch_ref)
+
+        if document is None:
+            return None
+
+        return document_to_batch(document)
+
+    def added(self) -> list[Batch]:
+        return self._added
+
+    def commit(self):
+        with self._store.lock:
+            for batch in self._added:
+                if batch.reference is None:
+                    batch.reference = self._store.next_reference("batch")
+
+                self._store.batches[batch.reference] = stored(batch_to_document(batch), self._store.next_seq_no())
+
+        self._added.clear()
+
+    def rollback(self):
+        self._added.clear()
+
+
+class MemorySourceRepository:
+    def __init__(self, store: MemoryStore):
+        self._store = store
+        self._added: list[Source] = []
+
+    def add(self, source: Source) -> str:
+        self._added.append(source)
+        return source.name
+
+    def get(self, name: str) -> Source | None:
+        document = self._store.sources.get(name)
+
+        if document is None:
+            return None
+
+        return document_to_source(document)
+
+    def added(self) -> list[Source]:
+        return self._added
+
+    def commit(self):
+        with self._store.lock:
+            for source in self._added:
+                self._store.sources[source.name] = stored(source_to_document(source), self._store.next_seq_no())
+
+        self._added.clear()
+
+    def rollback(self):
+        self._added.clear()
@@ -1,8 +1,29 @@
-from typing import Protocol
+from dataclasses import dataclass
+from typing import Iterator, Protocol
 
 from leaftracker.domain.model import Batch, Species, Source
 
 
+class ConcurrentModification(Exception):
+    def __init__(self, references: list[str]):
+        super().__init__(f"Modified concurrently: {', '.join(references)}")
+        self.references = references
+
+
+@dataclass
+class BulkFailure:
+    position: int
+    document_id: str | None
+    status: int
+    reason: str
+
+
+class BulkWriteError(Exception):
+    def __init__(self, failures: list[BulkFailure]):
+        super().__init__(f"{len(failures)} document(s) failed to index.")
+        self.failures = failures
+
+
 class BatchRepository(Protocol):
     def add(self, batch: Batch) -> str: ...
 
@@ -14,8 +35,34 @@ class SpeciesRepository(Protocol):
 
     def get(self, reference: str) -> Species | None: ...
 
+    def get_many(self, references: list[str]) -> list[Species]: ...
+
+    def iter_all(self) -> Iterator[Species]: ...
+
+    def find_by_name(self, name: str, include_previous: bool = True, prefix: bool = False) -> list[Species]: ...
+
 
 class SourceRepository(Protocol):
     def add(self, source: Source) -> str: ...
 
     def get(self, name: str) -> Source | None: ...
+
+
+class AsyncBatchRepository(Protocol):
+    def add(self, batch: Batch) -> str: ...
+
+    async def get(self, batch_ref: str) -> Batch | None: ...
+
+
+class AsyncSpeciesRepository(Protocol):
+    def add(self, species: Species): ...
+
+    async def get(self, reference: str) -> Species | None: ...
+
+    async def get_many(self, references: list[str]) -> list[Species]: ...
+
+
+class AsyncSourceRepository(Protocol):
+    def add(self, source: Source) -> str: ...
+
+    async def get(self, name: str) -> Source | None: ...
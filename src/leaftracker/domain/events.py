@@ -0,0 +1,38 @@
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from leaftracker.domain.model import BatchType, StockSize
+
+
+@dataclass(frozen=True)
+class Event:
+    reference: str | None
+
+
+@dataclass(frozen=True)
+class SpeciesAdded(Event):
+    name: str
+
+
+@dataclass(frozen=True)
+class SpeciesRenamed(Event):
+    previous_name: str | None
+    name: str
+
+
+@dataclass(frozen=True)
+class BatchAdded(Event):
+    source: str
+    batch_type: "BatchType"
+
+
+@dataclass(frozen=True)
+class StockAdded(Event):
+    species_ref: str
+    quantity: int
+    size: "StockSize"
+
+
+def with_reference(events: list[Event], reference: str | None) -> list[Event]:
+    return [event if event.reference is not None else replace(event, reference=reference) for event in events]
@@ -0,0 +1,168 @@
+from array import array
+from itertools import compress
+from typing import Any, Iterable, Sequence
+
+from leaftracker.domain.events import StockAdded
+from leaftracker.domain.model import Batch, BatchType, Source, Stock, StockSize
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+SIZE_CODES = max(size.value for size in StockSize) + 1
+
+
+def group_sums(keys: Any, values: Any) -> dict[int, int]:
+    if numpy is not None:
+        counts = numpy.bincount(keys)
+        totals = numpy.bincount(keys, weights=values)
+        present = numpy.flatnonzero(counts)
+        return dict(zip(present.tolist(), totals[present].astype(numpy.int64).tolist()))
+
+    sums: dict[int, int] = {}
+    for key, value in zip(keys, values):
+        sums[key] = sums.get(key, 0) + value
+    return sums
+
+
+def size_keys(species: Any, sizes: Any) -> Any:
+    if numpy is not None:
+        return species.astype(numpy.int64) * SIZE_CODES + sizes
+
+    return [code * SIZE_CODES + size for code, size in zip(species, sizes)]
+
+
+class Codes:
+    def __init__(self):
+        self._codes: dict[str, int] = {}
+        self._values: list[str] = []
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+
+        return code
+
+    def decode(self, code: int) -> str:
+        return self._values[code]
+
+    def find(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class Inventory:
+    def __init__(self):
+        self._species_codes = Codes()
+        self._species = array("l")
+        self._quantity = array("q")
+        self._size = array("b")
+        self._batch_type = array("b")
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[Batch]) -> "Inventory":
+        inventory = cls()
+
+        for batch in batches:
+            inventory.add_batch(batch)
+
+        return inventory
+
+    def batch(self, source: Source, batch_type: BatchType, reference: str | None = None) -> "InventoryBatch":
+        return InventoryBatch(self, source, batch_type, reference)
+
+    def add_batch(self, batch: Batch) -> "InventoryBatch":
+        view = self.batch(batch.source, batch.batch_type, batch.reference)
+
+        for stock in batch.stock():
+            view.add(stock)
+
+        return view
+
+    def append(self, stock: Stock, batch_type: BatchType) -> int:
+        self._species.append(self._species_codes.encode(stock.species_ref))
+        self._quantity.append(stock.quantity)
+        self._size.append(stock.size.value)
+        self._batch_type.append(batch_type.value)
+        return len(self._quantity) - 1
+
+    def stock_at(self, row: int) -> Stock:
+        return Stock(
+            species_ref=self._species_codes.decode(self._species[row]),
+            quantity=self._quantity[row],
+            size=StockSize(self._size[row])
+        )
+
+    def totals(self, batch_type: BatchType | None = None) -> dict[str, int]:
+        species, quantity = self._columns(batch_type, self._species, self._quantity)
+        sums = group_sums(species, quantity)
+        return {self._species_codes.decode(code): total for code, total in sums.items()}
+
+    def totals_by_size(self, batch_type: BatchType | None = None) -> dict[tuple[str, StockSize], int]:
+        species, size, quantity = self._columns(batch_type, self._species, self._size, self._quantity)
+        sums = group_sums(size_keys(species, size), quantity)
+
+        return {
+            (self._species_codes.decode(key // SIZE_CODES), StockSize(key % SIZE_CODES)): total
+            for key, total in sums.items()
+        }
+
+    def quantity_in(self, rows: Sequence[int], species_ref: str, size: StockSize | None = None) -> int:
+        code = self._species_codes.find(species_ref)
+
+        return sum(
+            self._quantity[row] for row in rows
+            if self._species[row] == code and (size is None or self._size[row] == size.value)
+        )
+
+    def species_in(self, rows: Sequence[int]) -> list[str]:
+        return [self._species_codes.decode(code) for code in dict.fromkeys(self._species[row] for row in rows)]
+
+    def _columns(self, batch_type: BatchType | None, *columns: array) -> list[Any]:
+        if numpy is not None:
+            vectors = [numpy.frombuffer(column, dtype=column.typecode) for column in columns]
+
+            if batch_type is not None:
+                mask = numpy.frombuffer(self._batch_type, dtype=self._batch_type.typecode) == batch_type.value
+                vectors = [vector[mask] for vector in vectors]
+
+            return vectors
+
+        if batch_type is None:
+            return list(columns)
+
+        wanted = [kind == batch_type.value for kind in self._batch_type]
+        return [list(compress(column, wanted)) for column in columns]
+
+    def __len__(self) -> int:
+        return len(self._quantity)
+
+
+class InventoryBatch(Batch):
+    def __init__(self, inventory: Inventory, source: Source, batch_type: BatchType, reference: str | None = None):
+        super().__init__(source, batch_type, reference)
+        self._inventory = inventory
+        self._rows = array("l")
+
+    def add(self, stock: Stock):
+        self._rows.append(self._inventory.append(stock, self.batch_type))
+        self.events.append(StockAdded(self.reference, stock.species_ref, stock.quantity, stock.size))
+
+    def stock(self) -> list[Stock]:
+        return [self._inventory.stock_at(row) for row in self._rows]
+
+    def species(self) -> list[str]:
+        return self._inventory.species_in(self._rows)
+
+    def quantity(self, species_ref: str) -> int:
+        return self._inventory.quantity_in(self._rows, species_ref)
+
+    def quantity_of_size(self, species_ref: str, size: StockSize) -> int:
+        return self._inventory.quantity_in(self._rows, species_ref, size)
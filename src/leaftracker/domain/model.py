@@ -1,6 +1,11 @@
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Iterator
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from leaftracker.domain.events import BatchAdded, Event, SpeciesAdded, SpeciesRenamed, StockAdded, with_reference
+
+TAXON_CACHE_SIZE = 65_536
 
 
 @dataclass(frozen=True)
@@ -14,45 +19,72 @@ class MalformedTaxonName(Exception):
     pass
 
 
+def taxon_parts(name: str) -> tuple[str, ...]:
+    parts = name.split()
+
+    if len(parts) == 2:
+        return parts[0].capitalize(), parts[1].lower()
+    if len(parts) == 3:
+        return parts[0].capitalize(), parts[1].lower(), parts[2].lower()
+
+    raise MalformedTaxonName(
+        f"Taxon must have two or three ranks. Genus, species and optionally subspecies."
+    )
+
+
+@lru_cache(maxsize=TAXON_CACHE_SIZE)
+def cached_parts(name: str) -> tuple[str, ...]:
+    return taxon_parts(name)
+
+
 class TaxonName:
-    def __init__(self, name: str):
-        self._parts = name.split()
-        if len(self._parts) not in (2, 3):
-            raise MalformedTaxonName(
-                f"Taxon must have two or three ranks. Genus, species and optionally subspecies."
-            )
+    __slots__ = ("_parts",)
 
-    def has_subspecies(self) -> bool:
-        return len(self._parts) == 3
+    _parts: tuple[str, ...]
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_parts", cached_parts(name))
 
     @property
     def genus(self) -> str:
-        return self._parts[0].capitalize()
+        return self._parts[0]
 
     @property
     def species(self) -> str:
-        return self._parts[1].lower()
+        return self._parts[1]
 
     @property
     def subspecies(self) -> str | None:
-        if self.has_subspecies():
-            return self._parts[2].lower()
-        return None
+        return self._parts[2] if len(self._parts) == 3 else None
+
+    def has_subspecies(self) -> bool:
+        return len(self._parts) == 3
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TaxonName is immutable, cannot set {name}.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TaxonName is immutable, cannot delete {name}.")
+
+    def __reduce__(self):
+        return TaxonName, (str(self),)
 
     def __str__(self) -> str:
-        if self.has_subspecies():
-            return f"{self.genus} {self.species} {self.subspecies}"
-        else:
-            return f"{self.genus} {self.species}"
+        return " ".join(self._parts)
 
     def __repr__(self):
         return f"<TaxonName {self.genus} {self.species}>"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, TaxonName):
             return False
         return self._parts == other._parts
 
+    def __hash__(self):
+        return hash(self._parts)
+
 
 class TaxonHistory:
     def __init__(self, current_name: str | None):
@@ -90,6 +122,24 @@ class Species:
         self.taxon_history = TaxonHistory(current_name)
         self.common_names: list[str] = []
         self.web_references: list[WebReference] = []
+        self.events: list[Event] = []
+
+        if reference is None:
+            self.events.append(SpeciesAdded(None, str(self.taxon_history.current())))
+
+    def rename(self, name: str):
+        previous = self.taxon_history.current()
+        if previous is not None and previous == TaxonName(name):
+            return
+
+        self.taxon_history.new_current_name(name)
+        self.events.append(SpeciesRenamed(self.reference, str(previous) if previous else None,
+                                          str(self.taxon_history.current())))
+
+    def collect_events(self) -> list[Event]:
+        events = with_reference(self.events, self.reference)
+        self.events.clear()
+        return events
 
     def __repr__(self):
         return f"<Species {self.reference}>"
@@ -141,29 +191,50 @@ class BatchType(Enum):
 
 
 class Batch:
-    def __init__(self, source: Source, batch_type: BatchType, reference: str | None = None):
+    def __init__(self, source: Source, batch_type: BatchType, reference: str | None = None,
+                 stock: Iterable[Stock] = (), external_id: str | None = None):
         self.reference = reference
+        self.external_id = external_id
         self.batch_type = batch_type
         self.source = source
         self._stock: list[Stock] = []
+        self._quantities: dict[str, int] = {}
+        self._sized_quantities: dict[tuple[str, StockSize], int] = {}
+        self.events: list[Event] = []
+
+        if reference is None:
+            self.events.append(BatchAdded(None, source.name, batch_type))
+
+        for line in stock:
+            self._tally(line)
 
     def add(self, stock: Stock):
+        self._tally(stock)
+        self.events.append(StockAdded(self.reference, stock.species_ref, stock.quantity, stock.size))
+
+    def _tally(self, stock: Stock):
         self._stock.append(stock)
+        self._quantities[stock.species_ref] = self.quantity(stock.species_ref) + stock.quantity
+
+        key = (stock.species_ref, stock.size)
+        self._sized_quantities[key] = self._sized_quantities.get(key, 0) + stock.quantity
+
+    def stock(self) -> list[Stock]:
+        return list(self._stock)
 
     def species(self) -> list[str]:
-        return [stock.species_ref for stock in self._stock]
+        return list(self._quantities)
 
     def quantity(self, species_ref: str) -> int:
-        return sum(
-            [stock.quantity for stock in self._stock
-             if stock.species_ref == species_ref]
-        )
+        return self._quantities.get(species_ref, 0)
 
     def quantity_of_size(self, species_ref: str, size: StockSize) -> int:
-        return sum(
-            [stock.quantity for stock in self._stock
-             if stock.species_ref == species_ref and stock.size == size]
-        )
+        return self._sized_quantities.get((species_ref, size), 0)
+
+    def collect_events(self) -> list[Event]:
+        events = with_reference(self.events, self.reference)
+        self.events.clear()
+        return events
 
     def __eq__(self, other):
         if not isinstance(other, Batch):
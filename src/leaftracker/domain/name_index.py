@@ -0,0 +1,163 @@
+from typing import Iterable, Iterator
+
+from leaftracker.domain.model import Species, TaxonHistory, TaxonName
+
+
+class TrieNode:
+    __slots__ = ("children", "references")
+
+    def __init__(self):
+        self.children: dict[str, TrieNode] = {}
+        self.references: set[str] = set()
+
+    def walk(self) -> Iterator["TrieNode"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children.values()))
+
+
+def normalise(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def name_keys(name: TaxonName) -> list[str]:
+    full_name = normalise(str(name))
+    epithet = full_name.split(" ", 1)[1]
+    return [full_name, epithet]
+
+
+class TaxonNameIndex:
+    def __init__(self):
+        self._root = TrieNode()
+        self._keys: dict[str, list[str]] = {}
+        self._full_names: dict[str, set[str]] = {}
+
+    @classmethod
+    def from_species(cls, species: Iterable[Species]) -> "TaxonNameIndex":
+        index = cls()
+
+        for each in species:
+            if each.reference is not None:
+                index.add(each.reference, each.taxon_history)
+
+        return index
+
+    def add(self, reference: str, history: TaxonHistory):
+        self.remove(reference)
+
+        keys = [key for name in history for key in name_keys(name)]
+        for key in keys:
+            self._node(key, create=True).references.add(reference)  # type: ignore
+
+        self._keys[reference] = keys
+
+        for name in history:
+            self._full_names.setdefault(normalise(str(name)), set()).add(reference)
+
+    def remove(self, reference: str):
+        for key in self._keys.pop(reference, []):
+            node = self._node(key)
+            if node is not None:
+                node.references.discard(reference)
+
+            references = self._full_names.get(key)
+            if references is not None:
+                references.discard(reference)
+                if not references:
+                    del self._full_names[key]
+
+    def lookup(self, name: str) -> list[str]:
+        return sorted(self._full_names.get(normalise(name), ()))
+
+    def prefix(self, text: str, limit: int | None = None) -> list[str]:
+        node = self._node(normalise(text))
+        if node is None:
+            return []
+
+        return self._collect([node], limit)
+
+    def fuzzy(self, text: str, max_distance: int = 1, limit: int | None = None,
+              prefix_length: int = 1) -> list[str]:
+        query = normalise(text)
+        start = self._node(query[:prefix_length])
+        if start is None:
+            return []
+
+        query = query[prefix_length:]
+        length = len(query)
+        if length <= max_distance:
+            return self._collect([start], limit)
+
+        too_far = max_distance + 1
+        first_row = [min(column, too_far) for column in range(length + 1)]
+        matches: list[TrieNode] = []
+
+        stack = [(child, letter, 1, first_row) for letter, child in reversed(start.children.items())]
+        while stack:
+            node, letter, depth, previous_row = stack.pop()
+
+            row = [too_far] * (length + 1)
+            closest = row[0] = depth if depth < too_far else too_far
+
+            for column in range(max(1, depth - max_distance), min(length, depth + max_distance) + 1):
+                distance = previous_row[column - 1] + (query[column - 1] != letter)
+                if row[column - 1] < distance:
+                    distance = row[column - 1] + 1
+                if previous_row[column] < distance:
+                    distance = previous_row[column] + 1
+                if distance > too_far:
+                    distance = too_far
+
+                row[column] = distance
+                if distance < closest:
+                    closest = distance
+
+            if row[length] <= max_distance:
+                matches.append(node)
+                if limit is not None and len(matches) >= limit:
+                    break
+            elif closest <= max_distance:
+                stack.extend(
+                    (child, next_letter, depth + 1, row)
+                    for next_letter, child in reversed(node.children.items())
+                )
+
+        return self._collect(matches, limit)
+
+    def search(self, text: str, max_distance: int = 1, limit: int = 10) -> list[str]:
+        return self.prefix(text, limit) or self.fuzzy(text, max_distance, limit)
+
+    def _node(self, key: str, create: bool = False) -> TrieNode | None:
+        node = self._root
+
+        for letter in key:
+            child = node.children.get(letter)
+
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[letter] = TrieNode()
+
+            node = child
+
+        return node
+
+    def _collect(self, nodes: list[TrieNode], limit: int | None) -> list[str]:
+        found: dict[str, None] = {}
+
+        for start in nodes:
+            for node in start.walk():
+                for reference in sorted(node.references):
+                    found[reference] = None
+                    if limit is not None and len(found) == limit:
+                        return list(found)
+
+        return list(found)
+
+    def __contains__(self, reference: str) -> bool:
+        return reference in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
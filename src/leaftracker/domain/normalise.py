@@ -0,0 +1,81 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Iterable, Iterator
+
+from leaftracker.domain.model import MalformedTaxonName, taxon_parts
+
+CHUNK_SIZE = 5_000
+PARALLEL_THRESHOLD = 50_000
+
+Result = tuple[str | None, str | None]
+
+
+@dataclass(slots=True)
+class NormalisedName:
+    position: int
+    raw: str
+    name: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def normalise_chunk(names: list[str]) -> list[Result]:
+    results: list[Result] = []
+
+    for raw in names:
+        try:
+            results.append((" ".join(taxon_parts(raw)), None))
+        except MalformedTaxonName as error:
+            results.append((None, str(error)))
+
+    return results
+
+
+def chunked(names: Iterator[str], size: int) -> Iterator[list[str]]:
+    while chunk := list(islice(names, size)):
+        yield chunk
+
+
+def in_order(chunks: Iterator[list[str]], processes: int | None) -> Iterator[tuple[list[str], list[Result]]]:
+    workers = processes or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = 2 * workers
+        pending: deque[tuple[list[str], Future]] = deque()
+
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(normalise_chunk, chunk)))
+
+            if len(pending) >= window:
+                names, future = pending.popleft()
+                yield names, future.result()
+
+        while pending:
+            names, future = pending.popleft()
+            yield names, future.result()
+
+
+def normalise_names(names: Iterable[str], processes: int | None = None, chunk_size: int = CHUNK_SIZE,
+                    parallel_threshold: int = PARALLEL_THRESHOLD) -> Iterator[NormalisedName]:
+    remaining = iter(names)
+    head = list(islice(remaining, parallel_threshold))
+
+    chunks: Iterator[tuple[list[str], list[Result]]]
+
+    if len(head) < parallel_threshold or processes == 1:
+        chunks = ((names, normalise_chunk(names)) for names in chunked(chain(head, remaining), chunk_size))
+    else:
+        chunks = in_order(chunked(chain(head, remaining), chunk_size), processes)
+
+    position = 0
+
+    for raw_names, results in chunks:
+        for raw, (name, error) in zip(raw_names, results):
+            yield NormalisedName(position, raw, name, error)
+            position += 1
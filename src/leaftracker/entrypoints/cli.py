@@ -0,0 +1,123 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Callable
+
+from leaftracker.service_layer.elastic_uow import ElasticUnitOfWork
+from leaftracker.service_layer.importer import (
+    CHUNK_SIZE, MANIFEST_CHUNK_LINES, ImportReport, ManifestReport, import_manifest, import_species
+)
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+
+def uow_factory(args: argparse.Namespace) -> Callable[[], UnitOfWork]:
+    if args.dry_run:
+        store = MemoryUnitOfWork().store
+        return lambda: MemoryUnitOfWork(store)
+
+    return lambda: ElasticUnitOfWork(args.index_prefix)
+
+
+def file_format(path: Path, requested: str | None) -> str:
+    if requested is not None:
+        return requested
+    return "jsonl" if path.suffix in (".jsonl", ".ndjson") else "csv"
+
+
+def print_progress(report: ImportReport) -> None:
+    print(
+        f"\r{report.rows} rows, {report.imported} imported, {report.rejected} rejected, "
+        f"{report.rows_per_second:.0f} rows/s",
+        end="", file=sys.stderr, flush=True,
+    )
+
+
+def print_report(report: ImportReport) -> None:
+    print(file=sys.stderr)
+    print(f"Imported {report.imported} of {report.rows} rows in {report.seconds:.1f}s "
+          f"({report.rows_per_second:.0f} rows/s).")
+
+    if isinstance(report, ManifestReport):
+        print(f"Created {report.batches} batches.")
+
+    for rejection in report.rejections:
+        print(f"Line {rejection.line}: {rejection.reason}")
+
+    if report.rejected > len(report.rejections):
+        print(f"... and {report.rejected - len(report.rejections)} more rejected rows.")
+
+
+def import_species_command(args: argparse.Namespace) -> int:
+    with open(args.path, newline="", encoding="utf-8") as lines:
+        report = import_species(
+            lines,
+            uow_factory(args),
+            file_format=file_format(args.path, args.format),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            progress=print_progress,
+        )
+
+    print_report(report)
+    return 1 if report.rejected else 0
+
+
+def import_manifest_command(args: argparse.Namespace) -> int:
+    with open(args.path, newline="", encoding="utf-8") as lines:
+        report = import_manifest(
+            lines,
+            uow_factory(args)(),
+            chunk_lines=args.chunk_lines,
+            progress=print_progress,
+        )
+
+    print_report(report)
+    return 1 if report.rejected else 0
+
+
+def migrate_command(args: argparse.Namespace) -> int:
+    uow = ElasticUnitOfWork(args.index_prefix)
+
+    for index in (uow.species().index, uow.batches().index, uow.sources().index):
+        migration = index.lifecycle.upgrade()
+
+        if migration is None:
+            print(f"{index.name} is up to date.")
+        else:
+            print(f"Migrated {index.name} from {migration.source} to {migration.target}.")
+
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    root = argparse.ArgumentParser(prog="leaftracker")
+    root.add_argument("--index-prefix", default="")
+    root.add_argument("--dry-run", action="store_true", help="Validate and load into memory only.")
+    commands = root.add_subparsers(required=True)
+
+    species = commands.add_parser("import-species", help="Import species from a CSV or JSONL file.")
+    species.add_argument("path", type=Path)
+    species.add_argument("--format", choices=["csv", "jsonl"])
+    species.add_argument("--workers", type=int, default=4)
+    species.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    species.set_defaults(command=import_species_command)
+
+    manifest = commands.add_parser("import-manifest", help="Add batches from a nursery manifest CSV file.")
+    manifest.add_argument("path", type=Path)
+    manifest.add_argument("--chunk-lines", type=int, default=MANIFEST_CHUNK_LINES)
+    manifest.set_defaults(command=import_manifest_command)
+
+    migrate = commands.add_parser("migrate", help="Reindex indices whose mappings or aliases are out of date.")
+    migrate.set_defaults(command=migrate_command)
+
+    return root
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parser().parse_args(argv)
+    return args.command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
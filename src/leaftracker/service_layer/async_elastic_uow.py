@@ -0,0 +1,47 @@
+from typing import Self
+
+from elasticsearch import AsyncElasticsearch
+
+from leaftracker.adapters.async_elastic_repository import (
+    AsyncBatchRepository, AsyncSourceRepository, AsyncSpeciesRepository
+)
+from leaftracker.adapters.document_cache import DocumentCache
+from leaftracker.adapters.elastic_client import get_async_client
+from leaftracker.adapters.elastic_index import RefreshPolicy
+from leaftracker.adapters.elastic_repository import BATCH_INDEX, SOURCE_INDEX, SPECIES_INDEX
+
+
+class AsyncElasticUnitOfWork:
+    def __init__(self, index_prefix: str = "", client: AsyncElasticsearch | None = None,
+                 cache: DocumentCache | None = None, refresh: RefreshPolicy = RefreshPolicy.NONE):
+        self._client = client or get_async_client()
+        self._batches = AsyncBatchRepository(index_prefix + BATCH_INDEX, self._client, refresh)
+        self._sources = AsyncSourceRepository(index_prefix + SOURCE_INDEX, self._client, refresh)
+        self._species = AsyncSpeciesRepository(index_prefix + SPECIES_INDEX, self._client, cache, refresh)
+
+    async def __aenter__(self) -> Self:
+        for repository in (self._batches, self._sources, self._species):
+            await repository.index.lifecycle.create()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.rollback()
+
+    async def commit(self) -> None:
+        await self._sources.commit()
+        await self._batches.commit()
+        await self._species.commit()
+
+    async def rollback(self) -> None:
+        self._sources.rollback()
+        self._batches.rollback()
+        self._species.rollback()
+
+    def batches(self) -> AsyncBatchRepository:
+        return self._batches
+
+    def sources(self) -> AsyncSourceRepository:
+        return self._sources
+
+    def species(self) -> AsyncSpeciesRepository:
+        return self._species
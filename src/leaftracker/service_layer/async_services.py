@@ -0,0 +1,84 @@
+from typing import Awaitable, Callable, TypeVar
+
+from leaftracker.adapters.repository import ConcurrentModification
+from leaftracker.domain.model import Source, SourceType, BatchType, Species
+from leaftracker.domain.name_index import TaxonNameIndex
+from leaftracker.service_layer.services import (
+    ServiceError, committed_reference, index_names, new_batch, rename_found
+)
+from leaftracker.service_layer.unit_of_work import AsyncUnitOfWork
+
+T = TypeVar("T")
+
+
+async def add_nursery(name: str, uow: AsyncUnitOfWork):
+    async with uow:
+        uow.sources().add(Source(name, SourceType.NURSERY))
+        await uow.commit()
+
+
+async def add_program(name: str, uow: AsyncUnitOfWork):
+    async with uow:
+        uow.sources().add(Source(name, SourceType.PROGRAM))
+        await uow.commit()
+
+
+async def _add_batch(source_name: str, batch_type: BatchType, uow: AsyncUnitOfWork) -> str:
+    async with uow:
+        batchref = uow.batches().add(new_batch(await uow.sources().get(source_name), source_name, batch_type))
+        await uow.commit()
+
+    return batchref
+
+
+async def add_order(source_name: str, uow: AsyncUnitOfWork) -> str:
+    return await _add_batch(source_name, BatchType.ORDER, uow)
+
+
+async def add_delivery(source_name: str, uow: AsyncUnitOfWork) -> str:
+    return await _add_batch(source_name, BatchType.DELIVERY, uow)
+
+
+async def add_pickup(source_name: str, uow: AsyncUnitOfWork) -> str:
+    return await _add_batch(source_name, BatchType.PICKUP, uow)
+
+
+async def add_species(current_name: str, uow: AsyncUnitOfWork,
+                      name_index: TaxonNameIndex | None = None) -> str:
+    species = Species(current_name)
+
+    async with uow:
+        uow.species().add(species)
+        await uow.commit()
+
+    return committed_reference(species, name_index)
+
+
+async def rename_species(reference: str, name: str, uow: AsyncUnitOfWork,
+                         name_index: TaxonNameIndex | None = None) -> None:
+    async with uow:
+        species = await uow.species().get(reference)
+        renamed = rename_found([species] if species else [], {reference: name})
+        await uow.commit()
+
+        index_names(renamed, name_index)
+
+
+async def rename_species_many(mapping: dict[str, str], uow: AsyncUnitOfWork,
+                              name_index: TaxonNameIndex | None = None) -> None:
+    async with uow:
+        renamed = rename_found(await uow.species().get_many(list(mapping)), mapping)
+        await uow.commit()
+
+        index_names(renamed, name_index)
+
+
+async def retry_on_conflict(service: Callable[..., Awaitable[T]], *args, attempts: int = 3, **kwargs) -> T:
+    for attempt in range(1, attempts + 1):
+        try:
+            return await service(*args, **kwargs)
+        except ConcurrentModification:
+            if attempt == attempts:
+                raise
+
+    raise ServiceError(f"Service must be attempted at least once, not {attempts} times.")
@@ -1,30 +1,97 @@
+from threading import local
 from typing import Self
 
-from leaftracker.adapters.elastic_repository import SpeciesRepository, SPECIES_INDEX
-from leaftracker.adapters.repository import BatchRepository, SourceRepository
+from elasticsearch import Elasticsearch
+
+from leaftracker.adapters.document_cache import DocumentCache
+from leaftracker.adapters.elastic_client import get_client
+from leaftracker.adapters.elastic_index import RefreshPolicy
+from leaftracker.adapters.elastic_repository import (
+    BatchRepository, SourceRepository, SpeciesRepository, BATCH_INDEX, SOURCE_INDEX, SPECIES_INDEX
+)
+from leaftracker.adapters.instrumentation import NULL_SINK, Measurement, OperationTotals, Sink, Summary
+from leaftracker.service_layer.messagebus import Aggregate, MessageBus, collect_events
+
+
+class ElasticRepositories:
+    def __init__(self, index_prefix: str, client: Elasticsearch, cache: DocumentCache | None,
+                 refresh: RefreshPolicy, sink: Sink, collect_summary: bool):
+        self.metrics = Summary(sink) if collect_summary or sink.enabled else None
+        self.sink: Sink = self.metrics or sink
+        self.batches = BatchRepository(index_prefix + BATCH_INDEX, client, refresh, self.sink)
+        self.sources = SourceRepository(index_prefix + SOURCE_INDEX, client, refresh, self.sink)
+        self.species = SpeciesRepository(index_prefix + SPECIES_INDEX, client, cache, refresh, self.sink)
+        self.summary: dict[str, OperationTotals] = {}
 
 
 class ElasticUnitOfWork:
-    def __init__(self, index_prefix: str = ""):
-        self._species = SpeciesRepository(index_prefix + SPECIES_INDEX)
+    def __init__(self, index_prefix: str = "", client: Elasticsearch | None = None,
+                 cache: DocumentCache | None = None, refresh: RefreshPolicy = RefreshPolicy.NONE,
+                 sink: Sink = NULL_SINK, bus: MessageBus | None = None, collect_summary: bool = False):
+        self._client = client or get_client()
+        self._index_prefix = index_prefix
+        self._cache = cache
+        self._refresh = refresh
+        self._sink = sink
+        self._collect_summary = collect_summary
+        self._bus = bus
+        self._local = local()
+
+        self._repositories()
+
+    def _repositories(self) -> ElasticRepositories:
+        repositories = getattr(self._local, "repositories", None)
+
+        if repositories is None:
+            repositories = ElasticRepositories(
+                self._index_prefix, self._client, self._cache, self._refresh, self._sink, self._collect_summary
+            )
+            self._local.repositories = repositories
+
+        return repositories
+
+    @property
+    def summary(self) -> dict[str, OperationTotals]:
+        return self._repositories().summary
 
     def __enter__(self) -> Self:
+        metrics = self._repositories().metrics
+        if metrics is not None:
+            metrics.clear()
         return self
 
     def __exit__(self, *args):
         self.rollback()
+        repositories = self._repositories()
+        if repositories.metrics is not None:
+            repositories.summary = repositories.metrics.totals()
 
     def commit(self) -> None:
-        self._species.commit()
+        repositories = self._repositories()
+        documents = (len(repositories.sources.added()) + len(repositories.batches.added())
+                     + len(repositories.species.pending()))
+        aggregates: list[Aggregate] = [*repositories.batches.added(), *repositories.species.pending()]
+
+        with Measurement(repositories.sink, "uow.commit", "", documents=documents):
+            repositories.sources.commit()
+            repositories.batches.commit()
+            repositories.species.commit()
+
+        events = collect_events(aggregates)
+        if self._bus is not None:
+            self._bus.publish(events)
 
     def rollback(self) -> None:
-        self._species.rollback()
+        repositories = self._repositories()
+        repositories.sources.rollback()
+        repositories.batches.rollback()
+        repositories.species.rollback()
 
-    def batches(self) -> BatchRepository:  # type: ignore
-        pass
+    def batches(self) -> BatchRepository:
+        return self._repositories().batches
 
-    def sources(self) -> SourceRepository:  # type: ignore
-        pass
+    def sources(self) -> SourceRepository:
+        return self._repositories().sources
 
     def species(self) -> SpeciesRepository:
-        return self._species
+        return self._repositories().species
@@ -0,0 +1,49 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, Self, TypeVar
+
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+T = TypeVar("T")
+
+WORKERS = 8
+
+
+@dataclass
+class Outcome(Generic[T]):
+    args: tuple
+    result: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ServiceExecutor:
+    def __init__(self, uow: UnitOfWork, workers: int = WORKERS):
+        self._uow = uow
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def submit(self, service: Callable[..., T], *args: Any) -> Future[T]:
+        return self._pool.submit(service, *args, self._uow)
+
+    def map(self, service: Callable[..., T], calls: Iterable[tuple]) -> list[Outcome[T]]:
+        submitted = [(args, self.submit(service, *args)) for args in calls]
+        return [outcome(args, future) for args, future in submitted]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def outcome(args: tuple, future: Future[T]) -> Outcome[T]:
+    try:
+        return Outcome(args, result=future.result())
+    except Exception as error:
+        return Outcome(args, error=error)
@@ -0,0 +1,346 @@
+import csv
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import batched
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from leaftracker.adapters.repository import BulkWriteError, ConcurrentModification
+from leaftracker.domain.model import Batch, BatchType, MalformedTaxonName, Source, Species, Stock, StockSize
+from leaftracker.domain.name_index import TaxonNameIndex
+from leaftracker.service_layer.services import build_name_index
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+CHUNK_SIZE = 500
+MIN_CHUNK_SIZE = 50
+MAX_CHUNK_SIZE = 5000
+TARGET_CHUNK_SECONDS = 0.5
+MAX_REJECTIONS = 1000
+PREVIOUS_NAME_SEPARATOR = ";"
+MANIFEST_CHUNK_LINES = 5000
+MANIFEST_COLUMNS = ("batch", "source", "batch_type", "species", "quantity", "size")
+
+E = TypeVar("E", BatchType, StockSize)
+
+
+@dataclass
+class Row:
+    line: int
+    current_name: str
+    previous_names: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Rejected:
+    line: int
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    rejections: list[Rejected] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def reject(self, rejection: Rejected, max_rejections: int) -> None:
+        self.rejected += 1
+        if len(self.rejections) < max_rejections:
+            self.rejections.append(rejection)
+
+    def tick(self) -> None:
+        self.seconds = time.perf_counter() - self.started
+
+
+class ChunkSizer:
+    def __init__(self, initial: int = CHUNK_SIZE, minimum: int = MIN_CHUNK_SIZE,
+                 maximum: int = MAX_CHUNK_SIZE, target_seconds: float = TARGET_CHUNK_SECONDS):
+        self.size = max(minimum, min(initial, maximum))
+        self._minimum = minimum
+        self._maximum = maximum
+        self._target = target_seconds
+
+    def observe(self, rows: int, seconds: float) -> None:
+        if rows < self.size:
+            return
+
+        if seconds > self._target:
+            self.size = max(self._minimum, self.size // 2)
+        elif seconds < self._target / 2:
+            self.size = min(self._maximum, self.size * 2)
+
+
+def csv_rows(lines: Iterable[str]) -> Iterator[Row]:
+    reader = csv.DictReader(lines)
+
+    for record in reader:
+        previous = record.get("previous_names") or ""
+        yield Row(
+            line=reader.line_num,
+            current_name=record.get("current_name") or "",
+            previous_names=[name.strip() for name in previous.split(PREVIOUS_NAME_SEPARATOR) if name.strip()],
+        )
+
+
+def jsonl_rows(lines: Iterable[str]) -> Iterator[Row | Rejected]:
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as error:
+            yield Rejected(line, f"Invalid JSON: {error.msg}")
+            continue
+
+        if not isinstance(record, dict):
+            yield Rejected(line, "Expected a JSON object")
+            continue
+
+        current_name = record.get("current_name") or ""
+        previous_names = record.get("previous_names") or []
+
+        if not isinstance(current_name, str):
+            yield Rejected(line, "current_name must be a string")
+        elif not isinstance(previous_names, list) or not all(isinstance(name, str) for name in previous_names):
+            yield Rejected(line, "previous_names must be a list of names")
+        else:
+            yield Row(line=line, current_name=current_name, previous_names=previous_names)
+
+
+READERS: dict[str, Callable[[Iterable[str]], Iterator[Row | Rejected]]] = {
+    "csv": csv_rows,
+    "jsonl": jsonl_rows,
+}
+
+
+def row_to_species(row: Row) -> Species:
+    if not row.current_name.strip():
+        raise MalformedTaxonName("Row has no current name.")
+
+    species = Species(row.current_name)
+
+    for name in row.previous_names:
+        species.taxon_history.add_previous_name(name)
+
+    return species
+
+
+def validate(rows: Iterable[Row | Rejected]) -> Iterator[tuple[int, Species] | Rejected]:
+    for row in rows:
+        if isinstance(row, Rejected):
+            yield row
+            continue
+
+        try:
+            yield row.line, row_to_species(row)
+        except MalformedTaxonName as error:
+            yield Rejected(row.line, str(error))
+
+
+def failed_rows(chunk: list[tuple[int, Species]], error: Exception) -> dict[int, str]:
+    if isinstance(error, BulkWriteError):
+        return {chunk[failure.position][0]: failure.reason for failure in error.failures}
+
+    if isinstance(error, ConcurrentModification):
+        return {
+            line: str(error) for line, species in chunk
+            if species.reference is None or species.reference in error.references
+        }
+
+    return {line: str(error) for line, _ in chunk}
+
+
+def commit_chunk(uow_factory: Callable[[], UnitOfWork], chunk: list[tuple[int, Species]]) -> float:
+    started = time.perf_counter()
+
+    with uow_factory() as uow:
+        for _, species in chunk:
+            uow.species().add(species)
+        uow.commit()
+
+    return time.perf_counter() - started
+
+
+def import_species(lines: Iterable[str], uow_factory: Callable[[], UnitOfWork], file_format: str = "csv",
+                   workers: int = 4, chunk_size: int = CHUNK_SIZE, max_rejections: int = MAX_REJECTIONS,
+                   progress: Callable[[ImportReport], None] | None = None) -> ImportReport:
+    report = ImportReport()
+    sizer = ChunkSizer(chunk_size)
+    in_flight: dict[Future, list[tuple[int, Species]]] = {}
+    chunk: list[tuple[int, Species]] = []
+
+    def settle(done: Iterable[Future]):
+        for future in done:
+            committed = in_flight.pop(future)
+            try:
+                sizer.observe(len(committed), future.result())
+                report.imported += len(committed)
+            except Exception as error:
+                failed = failed_rows(committed, error)
+                report.imported += len(committed) - len(failed)
+
+                for line, reason in failed.items():
+                    report.reject(Rejected(line, f"Commit failed: {reason}"), max_rejections)
+
+        report.tick()
+        if progress is not None:
+            progress(report)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in validate(READERS[file_format](lines)):
+            report.rows += 1
+
+            if isinstance(item, Rejected):
+                report.reject(item, max_rejections)
+                continue
+
+            chunk.append(item)
+            if len(chunk) < sizer.size:
+                continue
+
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                settle(done)
+
+            in_flight[executor.submit(commit_chunk, uow_factory, chunk)] = chunk
+            chunk = []
+
+        if chunk:
+            in_flight[executor.submit(commit_chunk, uow_factory, chunk)] = chunk
+
+        settle(wait(in_flight).done)
+
+    report.tick()
+    return report
+
+
+class InvalidManifestLine(Exception):
+    pass
+
+
+@dataclass
+class ManifestLine:
+    line: int
+    batch: str
+    source: str
+    batch_type: str
+    species: str
+    quantity: str
+    size: str
+
+    @property
+    def batch_key(self) -> tuple[str, str, str]:
+        return self.batch, self.source, self.batch_type
+
+
+@dataclass
+class ManifestReport(ImportReport):
+    batches: int = 0
+
+
+def manifest_lines(lines: Iterable[str]) -> Iterator[ManifestLine]:
+    reader = csv.DictReader(lines)
+
+    for record in reader:
+        yield ManifestLine(reader.line_num, *((record.get(column) or "").strip() for column in MANIFEST_COLUMNS))
+
+
+def parse_enum(enum: type[E], value: str) -> E:
+    try:
+        return enum[value.upper()]
+    except KeyError:
+        raise InvalidManifestLine(f"Unknown {enum.__name__}: {value!r}")
+
+
+class ManifestResolver:
+    def __init__(self, uow: UnitOfWork, name_index: TaxonNameIndex):
+        self._uow = uow
+        self._name_index = name_index
+        self._sources: dict[str, Source | None] = {}
+
+    def source(self, name: str) -> Source:
+        if name not in self._sources:
+            with self._uow:
+                self._sources[name] = self._uow.sources().get(name)
+
+        source = self._sources[name]
+        if source is None:
+            raise InvalidManifestLine(f"No such source: {name!r}")
+
+        return source
+
+    def batch(self, line: ManifestLine) -> Batch:
+        return Batch(self.source(line.source), parse_enum(BatchType, line.batch_type), external_id=line.batch)
+
+    def stock(self, line: ManifestLine) -> Stock:
+        references = self._name_index.lookup(line.species)
+
+        if not references:
+            raise InvalidManifestLine(f"Unknown species: {line.species!r}")
+        if len(references) > 1:
+            raise InvalidManifestLine(f"Ambiguous species {line.species!r}: {', '.join(references)}")
+
+        try:
+            quantity = int(line.quantity)
+        except ValueError:
+            raise InvalidManifestLine(f"Quantity is not a number: {line.quantity!r}")
+
+        if quantity <= 0:
+            raise InvalidManifestLine(f"Quantity must be positive, not {quantity}")
+
+        return Stock(references[0], quantity, parse_enum(StockSize, line.size))
+
+
+def manifest_batches(lines: Iterable[ManifestLine], resolver: ManifestResolver,
+                     report: ManifestReport, max_rejections: int) -> list[Batch]:
+    batches: dict[tuple[str, str, str], Batch] = {}
+
+    for line in lines:
+        report.rows += 1
+
+        try:
+            batch = batches.get(line.batch_key)
+            if batch is None:
+                batch = batches[line.batch_key] = resolver.batch(line)
+            batch.add(resolver.stock(line))
+        except InvalidManifestLine as error:
+            report.reject(Rejected(line.line, str(error)), max_rejections)
+
+    return [batch for batch in batches.values() if batch.stock()]
+
+
+def persist_batches(batches: list[Batch], uow: UnitOfWork, report: ManifestReport) -> None:
+    with uow:
+        for batch in batches:
+            uow.batches().add(batch)
+        uow.commit()
+
+    report.batches += len(batches)
+    report.imported += sum(len(batch.stock()) for batch in batches)
+
+
+def import_manifest(lines: Iterable[str], uow: UnitOfWork, name_index: TaxonNameIndex | None = None,
+                    chunk_lines: int = MANIFEST_CHUNK_LINES, max_rejections: int = MAX_REJECTIONS,
+                    progress: Callable[[ImportReport], None] | None = None) -> ManifestReport:
+    report = ManifestReport()
+    resolver = ManifestResolver(uow, name_index or build_name_index(uow))
+
+    for chunk in batched(manifest_lines(lines), chunk_lines):
+        batches = manifest_batches(chunk, resolver, report, max_rejections)
+        if batches:
+            persist_batches(batches, uow, report)
+
+        report.tick()
+        if progress is not None:
+            progress(report)
+
+    report.tick()
+    return report
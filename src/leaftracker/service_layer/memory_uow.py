@@ -0,0 +1,64 @@
+from threading import local
+from typing import Self
+
+from leaftracker.adapters.memory_repository import (
+    MemoryBatchRepository, MemorySourceRepository, MemorySpeciesRepository, MemoryStore
+)
+from leaftracker.service_layer.messagebus import Aggregate, MessageBus, collect_events
+
+
+class MemoryRepositories:
+    def __init__(self, store: MemoryStore):
+        self.batches = MemoryBatchRepository(store)
+        self.sources = MemorySourceRepository(store)
+        self.species = MemorySpeciesRepository(store)
+
+
+class MemoryUnitOfWork:
+    def __init__(self, store: MemoryStore | None = None, bus: MessageBus | None = None):
+        self.store = store or MemoryStore()
+        self._bus = bus
+        self._local = local()
+
+    def _repositories(self) -> MemoryRepositories:
+        repositories = getattr(self._local, "repositories", None)
+
+        if repositories is None:
+            repositories = self._local.repositories = MemoryRepositories(self.store)
+
+        return repositories
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.rollback()
+
+    def commit(self) -> None:
+        repositories = self._repositories()
+        aggregates: list[Aggregate] = [*repositories.batches.added(), *repositories.species.pending()]
+
+        with self.store.lock:
+            repositories.species.check()
+            repositories.sources.commit()
+            repositories.batches.commit()
+            repositories.species.commit()
+
+        events = collect_events(aggregates)
+        if self._bus is not None:
+            self._bus.publish(events)
+
+    def rollback(self) -> None:
+        repositories = self._repositories()
+        repositories.sources.rollback()
+        repositories.batches.rollback()
+        repositories.species.rollback()
+
+    def batches(self) -> MemoryBatchRepository:
+        return self._repositories().batches
+
+    def sources(self) -> MemorySourceRepository:
+        return self._repositories().sources
+
+    def species(self) -> MemorySpeciesRepository:
+        return self._repositories().species
@@ -0,0 +1,162 @@
+import logging
+from collections import defaultdict, deque
+from dataclasses import replace
+from itertools import islice
+from queue import Empty, Queue
+from threading import Thread
+from time import monotonic
+from typing import Callable, Hashable, Iterable, Iterator, Protocol, Self
+
+from leaftracker.domain.events import Event, SpeciesRenamed
+
+BATCH_SIZE = 500
+LINGER_SECONDS = 0.05
+MAX_ERRORS = 100
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[list[Event]], None]
+
+
+class HandlerErrors(Exception):
+    def __init__(self, errors: list[Exception]):
+        super().__init__(f"{len(errors)} event handler(s) failed: {'; '.join(map(str, errors))}")
+        self.errors = errors
+
+
+class Aggregate(Protocol):
+    def collect_events(self) -> list[Event]: ...
+
+
+def collect_events(aggregates: Iterable[Aggregate]) -> list[Event]:
+    return [event for aggregate in aggregates for event in aggregate.collect_events()]
+
+
+def coalesce(events: Iterable[Event]) -> list[Event]:
+    latest: dict[Hashable, Event] = {}
+
+    for position, event in enumerate(events):
+        key: Hashable = position
+
+        if isinstance(event, SpeciesRenamed):
+            key = (SpeciesRenamed, event.reference)
+            earlier = latest.pop(key, None)
+
+            if isinstance(earlier, SpeciesRenamed):
+                event = replace(event, previous_name=earlier.previous_name)
+
+        latest[key] = event
+
+    return list(latest.values())
+
+
+def by_type(events: Iterable[Event]) -> dict[type[Event], list[Event]]:
+    groups: dict[type[Event], list[Event]] = defaultdict(list)
+
+    for event in events:
+        groups[type(event)].append(event)
+
+    return groups
+
+
+def batched(events: list[Event], size: int) -> Iterator[list[Event]]:
+    remaining = iter(events)
+    while batch := list(islice(remaining, size)):
+        yield batch
+
+
+class MessageBus:
+    def __init__(self, background: bool = False, batch_size: int = BATCH_SIZE,
+                 linger: float = LINGER_SECONDS, max_errors: int = MAX_ERRORS):
+        self._handlers: dict[type[Event], list[Handler]] = defaultdict(list)
+        self._batch_size = batch_size
+        self._linger = linger
+        self._queue: Queue[Event | None] | None = None
+        self._worker: Thread | None = None
+        self.errors: deque[Exception] = deque(maxlen=max_errors)
+
+        if background:
+            self._queue = Queue()
+            self._worker = Thread(target=self._run, args=(self._queue,), name="messagebus", daemon=True)
+            self._worker.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def subscribe(self, event_type: type[Event], handler: Handler) -> None:
+        self._handlers[event_type].append(handler)
+
+    def publish(self, events: Iterable[Event]) -> None:
+        if self._queue is None:
+            self.dispatch(events)
+            return
+
+        for event in events:
+            self._queue.put(event)
+
+    def dispatch(self, events: Iterable[Event]) -> None:
+        errors = []
+
+        for event_type, group in by_type(coalesce(events)).items():
+            handlers = self._handlers.get(event_type, [])
+            if not handlers:
+                continue
+
+            for batch in batched(group, self._batch_size):
+                for handler in handlers:
+                    try:
+                        handler(batch)
+                    except Exception as error:
+                        errors.append(error)
+
+        if errors:
+            raise HandlerErrors(errors)
+
+    def flush(self) -> None:
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._queue is not None and self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._queue = self._worker = None
+
+    def _run(self, queue: "Queue[Event | None]") -> None:
+        running = True
+
+        while running:
+            pending: list[Event] = []
+            item = queue.get()
+            taken = 1
+
+            if item is None:
+                running = False
+            else:
+                pending.append(item)
+                deadline = monotonic() + self._linger
+
+                while len(pending) < self._batch_size:
+                    try:
+                        item = queue.get(timeout=max(0.0, deadline - monotonic()))
+                    except Empty:
+                        break
+
+                    taken += 1
+                    if item is None:
+                        running = False
+                        break
+                    pending.append(item)
+
+            try:
+                self.dispatch(pending)
+            except HandlerErrors as failed:
+                for error in failed.errors:
+                    logger.error("Event handler failed", exc_info=error)
+                self.errors.extend(failed.errors)
+
+            for _ in range(taken):
+                queue.task_done()
@@ -1,6 +1,12 @@
+from typing import Callable, TypeVar
+
+from leaftracker.adapters.repository import ConcurrentModification
 from leaftracker.domain.model import Source, SourceType, Batch, BatchType, Species
+from leaftracker.domain.name_index import TaxonNameIndex
 from leaftracker.service_layer.unit_of_work import UnitOfWork
 
+T = TypeVar("T")
+
 
 class ServiceError(RuntimeError):
     pass
@@ -10,33 +16,60 @@ class InvalidSource(Exception):
     pass
 
 
+def new_batch(source: Source | None, source_name: str, batch_type: BatchType) -> Batch:
+    if not source:
+        raise InvalidSource(f"No such source: {source_name}")
+
+    return Batch(source=source, batch_type=batch_type)
+
+
+def committed_reference(species: Species, name_index: TaxonNameIndex | None) -> str:
+    if species.reference is None:
+        raise ServiceError("Committed species was not assigned a reference.")
+
+    if name_index is not None:
+        name_index.add(species.reference, species.taxon_history)
+
+    return species.reference
+
+
+def rename_found(found: list[Species], mapping: dict[str, str]) -> dict[str, Species]:
+    by_reference = {species.reference: species for species in found}
+
+    missing = [reference for reference in mapping if reference not in by_reference]
+    if len(missing) == 1:
+        raise ServiceError(f"No species for reference {missing[0]}.")
+    if missing:
+        raise ServiceError(f"No species for references {', '.join(missing)}.")
+
+    renamed = {reference: by_reference[reference] for reference in mapping}
+    for reference, name in mapping.items():
+        renamed[reference].rename(name)
+
+    return renamed
+
+
+def index_names(renamed: dict[str, Species], name_index: TaxonNameIndex | None) -> None:
+    if name_index is not None:
+        for reference, species in renamed.items():
+            name_index.add(reference, species.taxon_history)
+
+
 def add_nursery(name: str, uow: UnitOfWork):
     with uow:
-        source = Source(name, SourceType.NURSERY)
-        uow.sources().add(source)
+        uow.sources().add(Source(name, SourceType.NURSERY))
         uow.commit()
 
 
 def add_program(name: str, uow: UnitOfWork):
     with uow:
-        source = Source(name, SourceType.PROGRAM)
-        uow.sources().add(source)
+        uow.sources().add(Source(name, SourceType.PROGRAM))
         uow.commit()
 
 
 def _add_batch(source_name: str, batch_type: BatchType, uow: UnitOfWork) -> str:
     with uow:
-        source = uow.sources().get(source_name)
-
-        if not source:
-            raise InvalidSource(f"No such source: {source_name}")
-
-        batchref = uow.batches().add(
-            Batch(
-                source=source,
-                batch_type=batch_type
-            )
-        )
+        batchref = uow.batches().add(new_batch(uow.sources().get(source_name), source_name, batch_type))
         uow.commit()
 
     return batchref
@@ -54,25 +87,47 @@ def add_pickup(source_name: str, uow: UnitOfWork) -> str:
     return _add_batch(source_name, BatchType.PICKUP, uow)
 
 
-def add_species(current_name: str, uow: UnitOfWork) -> str:
+def add_species(current_name: str, uow: UnitOfWork,
+                name_index: TaxonNameIndex | None = None) -> str:
     species = Species(current_name)
 
     with uow:
         uow.species().add(species)
         uow.commit()
 
-    if species.reference is None:
-        raise ServiceError("Committed species was not assigned a reference.")
-
-    return species.reference
+    return committed_reference(species, name_index)
 
 
-def rename_species(reference: str, name: str, uow: UnitOfWork) -> None:
+def rename_species(reference: str, name: str, uow: UnitOfWork,
+                   name_index: TaxonNameIndex | None = None) -> None:
     with uow:
         species = uow.species().get(reference)
+        renamed = rename_found([species] if species else [], {reference: name})
+        uow.commit()
+
+        index_names(renamed, name_index)
 
-        if species is None:
-            raise ServiceError(f"No species for reference {reference}.")
 
-        species.taxon_history.new_current_name(name)
+def rename_species_many(mapping: dict[str, str], uow: UnitOfWork,
+                        name_index: TaxonNameIndex | None = None) -> None:
+    with uow:
+        renamed = rename_found(uow.species().get_many(list(mapping)), mapping)
         uow.commit()
+
+        index_names(renamed, name_index)
+
+
+def build_name_index(uow: UnitOfWork) -> TaxonNameIndex:
+    with uow:
+        return TaxonNameIndex.from_species(uow.species().iter_all())
+
+
+def retry_on_conflict(service: Callable[..., T], *args, attempts: int = 3, **kwargs) -> T:
+    for attempt in range(1, attempts + 1):
+        try:
+            return service(*args, **kwargs)
+        except ConcurrentModification:
+            if attempt == attempts:
+                raise
+
+    raise ServiceError(f"Service must be attempted at least once, not {attempts} times.")
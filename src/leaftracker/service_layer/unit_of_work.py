@@ -1,6 +1,9 @@
 from typing import Protocol, Self
 
-from leaftracker.adapters.repository import BatchRepository, SourceRepository, SpeciesRepository
+from leaftracker.adapters.repository import (
+    AsyncBatchRepository, AsyncSourceRepository, AsyncSpeciesRepository,
+    BatchRepository, SourceRepository, SpeciesRepository
+)
 
 
 class UnitOfWork(Protocol):
@@ -17,3 +20,19 @@ class UnitOfWork(Protocol):
     def sources(self) -> SourceRepository: ...
 
     def species(self) -> SpeciesRepository: ...
+
+
+class AsyncUnitOfWork(Protocol):
+    async def __aenter__(self) -> Self: ...
+
+    async def __aexit__(self, *args): ...
+
+    async def commit(self) -> None: ...
+
+    async def rollback(self) -> None: ...
+
+    def batches(self) -> AsyncBatchRepository: ...
+
+    def sources(self) -> AsyncSourceRepository: ...
+
+    def species(self) -> AsyncSpeciesRepository: ...
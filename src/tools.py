@@ -1,6 +1,6 @@
-from elasticsearch import Elasticsearch
+from leaftracker.adapters.elastic_client import get_client
 
-client = Elasticsearch(hosts="http://localhost:9200")
+client = get_client()
 
 
 def list_aliases():
@@ -9,7 +9,6 @@ def list_aliases():
 
 
 def list_test_aliases():
-    es = Elasticsearch(hosts="http://localhost:9200")
-    aliases = es.indices.get_alias(index="test_*")
+    aliases = client.indices.get_alias(index="test_*")
     for alias in aliases:
         print(alias)
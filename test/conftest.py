@@ -1,11 +1,12 @@
-from itertools import count
-from typing import Self, Iterator
+from typing import Self
 
 import pytest
-from elasticsearch import Elasticsearch
 
-from leaftracker.adapters.repository import BatchRepository, SourceRepository, SpeciesRepository
+from leaftracker.adapters.elastic_client import get_client
+from leaftracker.adapters.elastic_index import readiness
+from leaftracker.adapters.repository import AsyncBatchRepository, AsyncSourceRepository, AsyncSpeciesRepository
 from leaftracker.domain.model import Species, Batch, Source
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
 
 INDEX_TEST_PREFIX = "test_"
 
@@ -23,10 +24,11 @@ def dentifera() -> Species:
 
 
 def delete_test_indexes():
-    client = Elasticsearch(hosts="http://localhost:9200")
-    aliases = client.indices.get_alias(index="test_*")
-    for alias in aliases:
-        client.options(ignore_status=404).indices.delete(index=alias)
+    client = get_client()
+    indices = list(client.indices.get_alias(index="test_*"))
+    if indices:
+        client.options(ignore_status=404).indices.delete(index=indices)
+    readiness.clear()
 
 
 @pytest.fixture(autouse=True, scope='session')
@@ -35,88 +37,66 @@ def test_indexes():
     delete_test_indexes()
 
 
-def references(prefix: str) -> Iterator[str]:
-    for i in count(start=1):
-        yield f"{prefix}-{i:04}"
+class FakeAsyncBatchRepository:
+    def __init__(self, uow: MemoryUnitOfWork):
+        self._uow = uow
 
+    def add(self, batch: Batch) -> str:
+        return self._uow.batches().add(batch)
 
-class FakeSpeciesRepository:
-    def __init__(self):
-        self._added = set()
-        self._committed = dict()
-        self.references = references("species")
-
-    def add(self, species: Species):
-        self._added.add(species)
-
-    def get(self, reference: str) -> Species | None:
-        return self._committed.get(reference)
-
-    def commit(self):
-        for species in self._added:
-            species.reference = next(self.references)
-            self._committed[species.reference] = species
+    async def get(self, batch_ref: str) -> Batch | None:
+        return self._uow.batches().get(batch_ref)
 
-    def rollback(self):
-        self._added.clear()
 
+class FakeAsyncSourceRepository:
+    def __init__(self, uow: MemoryUnitOfWork):
+        self._uow = uow
 
-class FakeBatchRepository:
-    def __init__(self, batches: list[Batch]):
-        self._references = references("batch")
-        self._batches = set(batches)
+    def add(self, source: Source) -> str:
+        return self._uow.sources().add(source)
 
-    def add(self, batch: Batch) -> str:
-        batch.reference = next(self._references)
-        self._batches.add(batch)
-        return batch.reference
+    async def get(self, name: str) -> Source | None:
+        return self._uow.sources().get(name)
 
-    def get(self, batch_ref: str) -> Batch | None:
-        matching = (batch for batch in self._batches
-                    if batch.reference == batch_ref)
-        return next(matching, None)
 
+class FakeAsyncSpeciesRepository:
+    def __init__(self, uow: MemoryUnitOfWork):
+        self._uow = uow
 
-class FakeSourceRepository:
-    def __init__(self, sources: list[Source]):
-        self._sources = set(sources)
+    def add(self, species: Species):
+        self._uow.species().add(species)
 
-    def add(self, source: Source) -> str:
-        self._sources.add(source)
-        return source.name
+    async def get(self, reference: str) -> Species | None:
+        return self._uow.species().get(reference)
 
-    def get(self, name: str) -> Source | None:
-        matching = (source for source in self._sources
-                    if source.name == name)
-        return next(matching, None)
+    async def get_many(self, references: list[str]) -> list[Species]:
+        return self._uow.species().get_many(references)
 
 
-class FakeUnitOfWork:
+class FakeAsyncUnitOfWork:
     def __init__(self):
-        self._batches = FakeBatchRepository([])
-        self._sources = FakeSourceRepository([])
-        self._species = FakeSpeciesRepository()
+        self._uow = MemoryUnitOfWork()
+        self._batches = FakeAsyncBatchRepository(self._uow)
+        self._sources = FakeAsyncSourceRepository(self._uow)
+        self._species = FakeAsyncSpeciesRepository(self._uow)
 
-    def __enter__(self) -> Self:
+    async def __aenter__(self) -> Self:
         return self
 
-    def __exit__(self, *args):
-        self.rollback()
+    async def __aexit__(self, *args):
+        await self.rollback()
 
-    def commit(self) -> None:
-        self._species.commit()
+    async def commit(self) -> None:
+        self._uow.commit()
 
-    def rollback(self) -> None:
-        self._species.rollback()
+    async def rollback(self) -> None:
+        self._uow.rollback()
 
-    def batches(self) -> BatchRepository:
+    def batches(self) -> AsyncBatchRepository:
         return self._batches
 
-    def sources(self) -> SourceRepository:
+    def sources(self) -> AsyncSourceRepository:
         return self._sources
 
-    def species(self) -> SpeciesRepository:
+    def species(self) -> AsyncSpeciesRepository:
         return self._species
-
-    def set_species(self, repository: FakeSpeciesRepository):
-        self._species = repository
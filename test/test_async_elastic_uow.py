@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from conftest import INDEX_TEST_PREFIX
+from leaftracker.adapters.elastic_client import close_async_clients
+from leaftracker.adapters.elastic_repository import SPECIES_INDEX
+from leaftracker.domain.model import BatchType, TaxonName
+from leaftracker.service_layer import async_services
+from leaftracker.service_layer.async_elastic_uow import AsyncElasticUnitOfWork
+
+
+def run(coroutine):
+    async def scenario():
+        try:
+            return await coroutine
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(scenario())
+
+
+def test_should_add_index_prefix():
+    uow = AsyncElasticUnitOfWork(INDEX_TEST_PREFIX)
+    assert uow.species().index.name == INDEX_TEST_PREFIX + SPECIES_INDEX
+
+
+def test_should_commit(saligna):
+    async def scenario():
+        async with AsyncElasticUnitOfWork(INDEX_TEST_PREFIX) as uow:
+            uow.species().add(saligna)
+            await uow.commit()
+
+    run(scenario())
+    assert saligna.reference is not None
+
+
+def test_should_rollback_if_not_committed(saligna):
+    async def scenario():
+        async with AsyncElasticUnitOfWork(INDEX_TEST_PREFIX) as uow:
+            uow.species().add(saligna)
+
+    run(scenario())
+    assert saligna.reference is None
+
+
+def test_should_rename_concurrently():
+    names = ["Acacia saligna", "Acacia dentifera", "Baumea juncea"]
+
+    async def scenario():
+        uows = [AsyncElasticUnitOfWork(INDEX_TEST_PREFIX) for _ in names]
+        references = await asyncio.gather(
+            *(async_services.add_species(name, uow) for name, uow in zip(names, uows))
+        )
+        await asyncio.gather(
+            *(async_services.rename_species(reference, "Acacia cyclops", uow)
+              for reference, uow in zip(references, uows))
+        )
+
+        async with AsyncElasticUnitOfWork(INDEX_TEST_PREFIX) as uow:
+            return await uow.species().get_many(references)
+
+    renamed = run(scenario())
+    assert [species.taxon_history.current() for species in renamed] == [TaxonName("Acacia cyclops")] * 3
+
+
+def test_should_add_batch_from_source():
+    async def scenario():
+        uow = AsyncElasticUnitOfWork(INDEX_TEST_PREFIX)
+        await async_services.add_nursery("Trillion Trees", uow)
+        reference = await async_services.add_delivery("Trillion Trees", uow)
+
+        async with uow:
+            return await uow.batches().get(reference)
+
+    batch = run(scenario())
+    assert batch.source.name == "Trillion Trees"
+    assert batch.batch_type == BatchType.DELIVERY
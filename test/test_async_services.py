@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from conftest import FakeAsyncUnitOfWork
+from leaftracker.adapters.repository import ConcurrentModification
+from leaftracker.domain.model import BatchType, SourceType, TaxonName
+from leaftracker.service_layer import async_services
+from leaftracker.service_layer.services import InvalidSource, ServiceError
+
+
+@pytest.fixture
+def uow() -> FakeAsyncUnitOfWork:
+    return FakeAsyncUnitOfWork()
+
+
+def test_add_nursery(uow):
+    asyncio.run(async_services.add_nursery("Trillion Trees", uow))
+    source = asyncio.run(uow.sources().get("Trillion Trees"))
+    assert source.source_type == SourceType.NURSERY
+
+
+def test_add_order(uow):
+    async def scenario():
+        await async_services.add_program("Habitat Links", uow)
+        ref = await async_services.add_order("Habitat Links", uow)
+        return await uow.batches().get(ref)
+
+    batch = asyncio.run(scenario())
+    assert batch.batch_type == BatchType.ORDER
+
+
+def test_missing_source(uow):
+    with pytest.raises(InvalidSource, match="No such source: Rodeo Nursery"):
+        asyncio.run(async_services.add_delivery("Rodeo Nursery", uow))
+
+
+def test_add_species(uow):
+    assert asyncio.run(async_services.add_species("Acacia saligna", uow)) == "species-0001"
+
+
+def test_rename_species(uow):
+    async def scenario():
+        reference = await async_services.add_species("Baumea juncea", uow)
+        await async_services.rename_species(reference, "Machaerina juncea", uow)
+        return await uow.species().get(reference)
+
+    species = asyncio.run(scenario())
+    assert species.taxon_history.current() == TaxonName("Machaerina juncea")
+
+
+def test_rename_non_existent_species(uow):
+    with pytest.raises(ServiceError):
+        asyncio.run(async_services.rename_species("xyz", "Machaerina juncea", uow))
+
+
+def test_rename_many_species(uow):
+    async def scenario():
+        baumea = await async_services.add_species("Baumea juncea", uow)
+        acacia = await async_services.add_species("Acacia saligna", uow)
+        await async_services.rename_species_many({baumea: "Machaerina juncea", acacia: "Acacia cyclops"}, uow)
+        return await uow.species().get_many([baumea, acacia])
+
+    renamed = asyncio.run(scenario())
+    assert [species.taxon_history.current() for species in renamed] == [
+        TaxonName("Machaerina juncea"), TaxonName("Acacia cyclops")
+    ]
+
+
+def test_retry_on_conflict():
+    attempts = []
+
+    async def service(reference: str) -> str:
+        attempts.append(reference)
+        if len(attempts) < 2:
+            raise ConcurrentModification([reference])
+        return reference
+
+    assert asyncio.run(async_services.retry_on_conflict(service, "species-0001")) == "species-0001"
+    assert len(attempts) == 2
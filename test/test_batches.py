@@ -1,5 +1,6 @@
 import pytest
 
+from leaftracker.domain.events import BatchAdded, StockAdded
 from leaftracker.domain.model import Batch, Stock, Source, StockSize, BatchType, SourceType
 
 BANKSIA = "Banksia littoralis"
@@ -40,6 +41,29 @@ def test_should_get_species_list_from_batch(species_names, batch_of_three):
     assert set(batch_of_three.species()) == set(species_names)
 
 
+def test_should_list_each_species_once(batch):
+    batch.add(Stock(species_ref=BANKSIA, quantity=20, size=StockSize.TUBE))
+    batch.add(Stock(species_ref=HAKEA, quantity=5, size=StockSize.POT))
+    batch.add(Stock(species_ref=BANKSIA, quantity=10, size=StockSize.POT))
+
+    assert batch.species() == [BANKSIA, HAKEA]
+
+
+def test_should_keep_stock_history_in_order(batch):
+    first = Stock(species_ref=BANKSIA, quantity=20, size=StockSize.TUBE)
+    second = Stock(species_ref=HAKEA, quantity=5, size=StockSize.POT)
+    batch.add(first)
+    batch.add(second)
+    batch.add(first)
+
+    assert batch.stock() == [first, second, first]
+
+
+def test_should_have_no_quantity_of_missing_species(batch_of_three):
+    assert batch_of_three.quantity("Acacia saligna") == 0
+    assert batch_of_three.quantity_of_size("Acacia saligna", StockSize.POT) == 0
+
+
 def test_should_get_species_quantity(batch_of_three):
     assert batch_of_three.quantity(BANKSIA) == 20
 
@@ -70,3 +94,33 @@ def test_should_identify_batch_after_modification():
     assert a_batch == same_batch_modified
     assert hash(a_batch) == hash(same_batch_modified)
     assert len({a_batch, same_batch_modified}) == 1
+
+
+def test_should_record_stock_added_events(batch_of_three):
+    events = batch_of_three.collect_events()
+
+    assert [event.species_ref for event in events] == [BANKSIA, HAKEA, HYPOCALYMNA]  # type: ignore
+    assert all(isinstance(event, StockAdded) and event.reference == "batch-0001" for event in events)
+    assert batch_of_three.collect_events() == []
+
+
+def test_should_fill_in_reference_of_new_batch_events():
+    batch = Batch(Source("Trillion Trees", SourceType.NURSERY), BatchType.ORDER)
+    batch.add(Stock(species_ref=BANKSIA, quantity=5, size=StockSize.POT))
+    batch.reference = "batch-0002"
+
+    assert batch.collect_events() == [
+        BatchAdded("batch-0002", "Trillion Trees", BatchType.ORDER),
+        StockAdded("batch-0002", BANKSIA, 5, StockSize.POT),
+    ]
+
+
+def test_should_not_record_events_for_loaded_stock(species_names):
+    batch = Batch(
+        source=Source("Trillion Trees", SourceType.NURSERY),
+        batch_type=BatchType.DELIVERY,
+        reference="batch-0001",
+        stock=[Stock(species_ref=species, quantity=20, size=StockSize.TUBE) for species in species_names])
+
+    assert batch.quantity(HAKEA) == 20
+    assert batch.collect_events() == []
@@ -0,0 +1,106 @@
+import pytest
+
+from leaftracker.adapters.document_cache import DocumentCache
+from leaftracker.adapters.documents import Document
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def document(document_id: str, seq_no: int = 0, primary_term: int = 1) -> Document:
+    return Document(
+        document_id=document_id,
+        source={"content": f"{document_id} at {seq_no}"},
+        seq_no=seq_no,
+        primary_term=primary_term,
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock) -> DocumentCache:
+    return DocumentCache(max_size=2, ttl=10.0, clock=clock)
+
+
+class TestDocumentCache:
+    def test_should_miss_unknown_document(self, cache):
+        assert cache.get("species-0001") is None
+
+    def test_should_hit_fresh_document(self, cache):
+        cache.put(document("species-0001"))
+        assert cache.get("species-0001") == document("species-0001")
+
+    def test_should_ignore_unversioned_document(self, cache):
+        cache.put(Document(document_id="species-0001", source={}))
+        assert cache.get("species-0001") is None
+
+    def test_should_evict_least_recently_used(self, cache):
+        cache.put(document("species-0001"))
+        cache.put(document("species-0002"))
+        cache.get("species-0001")
+        cache.put(document("species-0003"))
+
+        assert cache.get("species-0002") is None
+        assert cache.get("species-0001") is not None
+        assert len(cache) == 2
+
+    def test_should_drop_stale_document_without_validator(self, cache, clock):
+        cache.put(document("species-0001"))
+        clock.now = 11.0
+        assert cache.get("species-0001") is None
+
+    def test_should_revalidate_stale_document(self, cache, clock):
+        cache.put(document("species-0001", seq_no=5))
+        clock.now = 11.0
+        assert cache.get("species-0001", lambda _: (1, 5)) == document("species-0001", seq_no=5)
+
+    def test_should_drop_stale_document_with_new_version(self, cache, clock):
+        cache.put(document("species-0001", seq_no=5))
+        clock.now = 11.0
+        assert cache.get("species-0001", lambda _: (1, 6)) is None
+        assert len(cache) == 0
+
+    def test_should_revalidate_stale_documents_together(self, cache, clock):
+        requested = []
+
+        def current_versions(document_ids):
+            requested.append(document_ids)
+            return {"species-0001": (1, 5), "species-0002": (1, 7)}
+
+        cache.put(document("species-0001", seq_no=5))
+        cache.put(document("species-0002", seq_no=6))
+        clock.now = 11.0
+
+        assert cache.get_many(["species-0001", "species-0002", "species-0003"], current_versions) == {
+            "species-0001": document("species-0001", seq_no=5)
+        }
+        assert requested == [["species-0001", "species-0002"]]
+        assert len(cache) == 1
+
+    def test_should_split_fresh_and_stale_documents(self, cache, clock):
+        cache.put(document("species-0001"))
+        clock.now = 11.0
+        cache.put(document("species-0002"))
+
+        assert cache.lookup(["species-0001", "species-0002"]) == (
+            {"species-0002": document("species-0002")}, ["species-0001"]
+        )
+
+    def test_should_keep_newer_version(self, cache):
+        cache.put(document("species-0001", seq_no=6))
+        cache.put(document("species-0001", seq_no=5))
+        assert cache.get("species-0001") == document("species-0001", seq_no=6)
+
+    def test_should_invalidate(self, cache):
+        cache.put(document("species-0001"))
+        cache.invalidate("species-0001")
+        assert cache.get("species-0001") is None
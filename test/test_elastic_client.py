@@ -0,0 +1,27 @@
+import socket
+
+from leaftracker.adapters.elastic_client import ClientConfig, create_client, get_client
+from leaftracker.adapters.elastic_index import Index
+
+
+def test_should_share_client_for_same_config():
+    assert get_client() is get_client(ClientConfig())
+
+
+def test_should_create_client_per_config():
+    assert get_client() is not get_client(ClientConfig(request_timeout=30.0))
+
+
+def test_should_share_client_between_index_and_lifecycle():
+    index = Index("test_index", mappings={})
+    assert index.client is get_client()
+
+
+def socket_options(config: ClientConfig) -> list:
+    node = create_client(config).transport.node_pool.all()[0]
+    return node.pool.conn_kw.get("socket_options", [])  # type: ignore
+
+
+def test_should_enable_tcp_keep_alive_on_pooled_connections():
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options(ClientConfig())
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) not in socket_options(ClientConfig(keep_alive=False))
@@ -1,11 +1,16 @@
 import pytest
+from elasticsearch import NotFoundError
 
-from leaftracker.adapters.elastic_index import Index, Document
+from leaftracker.adapters.elastic_index import (
+    Index, Document, Migration, ReadinessRegistry, bulk_operations, changes_since, copy_failures,
+    copy_operations, delete_operations, index_version, mapping_differences, readiness, reset_actions,
+    shard_checkpoints, swap_actions
+)
 
 
 @pytest.fixture
 def index() -> Index:
-    return Index(
+    index = Index(
         name="test_index",
         mappings={
             "properties": {
@@ -13,6 +18,8 @@ def index() -> Index:
             }
         }
     )
+    index.lifecycle.create()
+    return index
 
 
 @pytest.fixture
@@ -40,11 +47,238 @@ class TestIndex:
     def test_should_indicate_missing_document(self, index):
         assert not index.document_exists("not-a-doc")
 
+    def test_should_truncate_documents(self, index, document):
+        index.add_document(document)
+        index.refresh()
+
+        index.delete_all_documents(truncate=True)
+
+        assert index.document_count() == 0
+        index.add_document(document)
+        index.refresh()
+        assert index.document_count() == 1
+
     def test_should_confirm_document_exists(self, index, document):
         index.add_document(document)
         index.refresh()
         assert index.document_exists(document.document_id)
 
+    def test_should_add_documents_in_bulk(self, index):
+        index.delete_all_documents()
+        documents = [
+            Document(document_id=None, source={"content": "first"}),
+            Document(document_id="second", source={"content": "second"}),
+            Document(document_id=None, source={"content": "third"}),
+        ]
+
+        result = index.add_documents(documents, chunk_size=2)
+        index.refresh()
+
+        assert not result.failures
+        assert len(result.document_ids) == 3
+        assert result.document_ids[1] == "second"
+        assert index.document_count() == 3
+
+    def test_should_report_bulk_failures(self, index):
+        documents = [
+            Document(document_id=None, source={"content": "fine"}),
+            Document(document_id=None, source={"content": {"not": "text"}}),
+        ]
+
+        result = index.add_documents(documents)
+
+        assert result.document_ids[0] is not None
+        assert result.document_ids[1] is None
+        assert [failure.position for failure in result.failures] == [1]
+
+    def test_should_iterate_over_documents(self, index):
+        index.delete_all_documents()
+        index.add_documents([Document(document_id=f"doc-{i}", source={"content": "text"}) for i in range(25)])
+        index.refresh()
+
+        documents = list(index.iter_documents(page_size=10))
+
+        assert sorted(document.document_id for document in documents) == sorted(f"doc-{i}" for i in range(25))  # type: ignore
+
+    def test_should_iterate_over_slices(self, index):
+        index.delete_all_documents()
+        index.add_documents([Document(document_id=f"doc-{i}", source={"content": "text"}) for i in range(25)])
+        index.refresh()
+
+        documents = list(index.iter_documents(page_size=4, slices=3))
+
+        assert len({document.document_id for document in documents}) == 25
+
+
+def test_should_build_bulk_operations():
+    documents = [
+        Document(document_id=None, source={"content": "first"}),
+        Document(document_id="second", source={"content": "second"}),
+    ]
+
+    assert bulk_operations(documents) == [
+        {"index": {}},
+        {"content": "first"},
+        {"index": {"_id": "second"}},
+        {"content": "second"},
+    ]
+
+
+def test_should_add_version_conditions_to_bulk_operations():
+    document = Document(document_id="some-doc", source={}, seq_no=4, primary_term=1)
+
+    assert bulk_operations([document])[0] == {
+        "index": {"_id": "some-doc", "if_seq_no": 4, "if_primary_term": 1}
+    }
+
+
+def test_should_read_version_from_index_name():
+    assert index_version("species_v12") == 12
+    assert index_version("species") == 0
+
+
+def test_should_swap_aliases_atomically():
+    migration = Migration(source="species_v1", target="species_v2", task_id="node:1")
+
+    assert swap_actions("species", migration) == [
+        {"add": {"index": "species_v2", "alias": "species"}},
+        {"add": {"index": "species_v2", "alias": "species_write", "is_write_index": True}},
+        {"remove_index": {"index": "species_v1"}},
+    ]
+
+
+def test_should_find_missing_mapping_fields():
+    live = {"properties": {"name": {"type": "keyword"}}}
+    expected = {"properties": {"name": {"type": "keyword", "fields": {"prefix": {"type": "text"}}}}}
+
+    assert mapping_differences(live, expected) == ["properties.name.fields is missing"]
+
+
+def test_should_find_changed_mapping_types():
+    live = {"properties": {"name": {"type": "text"}}}
+    expected = {"properties": {"name": {"type": "keyword"}}}
+
+    assert mapping_differences(live, expected) == ["properties.name.type is 'text', not 'keyword'"]
+
+
+def test_should_accept_live_mappings_with_extra_fields():
+    live = {"properties": {"name": {"type": "keyword"}, "added": {"type": "long"}}}
+    assert mapping_differences(live, {"properties": {"name": {"type": "keyword"}}}) == []
+
+
+def test_should_build_delete_operations():
+    assert delete_operations("species_v2", ["one", "two"]) == [
+        {"delete": {"_index": "species_v2", "_id": "one"}},
+        {"delete": {"_index": "species_v2", "_id": "two"}},
+    ]
+
+
+def test_should_read_primary_shard_checkpoints():
+    stats = {"indices": {"species_v1": {"shards": {
+        "0": [{"routing": {"primary": True}, "seq_no": {"max_seq_no": 41}},
+              {"routing": {"primary": False}, "seq_no": {"max_seq_no": 39}}],
+        "1": [{"routing": {"primary": True}, "seq_no": {"max_seq_no": -1}}],
+    }}}}
+
+    assert shard_checkpoints(stats, "species_v1") == {0: 41, 1: -1}
+
+
+def test_should_query_changes_after_checkpoint():
+    assert changes_since(41) == {"query": {"range": {"_seq_no": {"gt": 41}}}, "version": True}
+
+
+def test_should_copy_changes_with_source_versions():
+    hits = [{"_id": "one", "_version": 3, "_source": {"content": "one"}}]
+
+    assert copy_operations("species_v2", hits) == [
+        {"index": {"_index": "species_v2", "_id": "one", "version": 3, "version_type": "external"}},
+        {"content": "one"},
+    ]
+
+
+def test_should_ignore_version_conflicts_when_copying():
+    items = [
+        {"index": {"_id": "one", "status": 201}},
+        {"index": {"_id": "two", "status": 409, "error": {"type": "version_conflict_engine_exception"}}},
+        {"index": {"_id": "three", "status": 400, "error": {"type": "mapper_parsing_exception"}}},
+    ]
+
+    assert copy_failures(items) == [items[2]["index"]]
+
+
+def test_should_replace_backing_indices_atomically():
+    assert reset_actions("species", "species_v3", ["species_v2"]) == [
+        {"add": {"index": "species_v3", "alias": "species"}},
+        {"add": {"index": "species_v3", "alias": "species_write", "is_write_index": True}},
+        {"remove_index": {"index": "species_v2"}},
+    ]
+
+
+class Body:
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeIndices:
+    def __init__(self, mappings: dict):
+        self._mappings = mappings
+
+    def exists(self, index: str) -> Body:
+        return Body(True)
+
+    def exists_alias(self, name: str) -> Body:
+        return Body(False)
+
+    def get_mapping(self, index: str) -> Body:
+        return Body({index: {"mappings": self._mappings}})
+
+
+class FakeElasticsearch:
+    def __init__(self, mappings: dict):
+        self.indices = FakeIndices(mappings)
+
+
+def test_should_keep_using_unmigrated_index(caplog):
+    client = FakeElasticsearch({"properties": {"content": {"type": "text"}}})
+    index = Index("legacy_index", {"properties": {"content": {"type": "keyword"}}}, client)  # type: ignore
+
+    index.lifecycle.create()
+
+    assert "legacy_index needs a migration" in caplog.text
+    assert readiness.write_options("legacy_index") == {"index": "legacy_index"}
+    readiness.invalidate("legacy_index")
+
+
+class TestReadinessRegistry:
+    def test_should_not_know_unverified_index(self):
+        assert not ReadinessRegistry().is_ready("test_index", {})
+
+    def test_should_remember_verified_index(self):
+        registry = ReadinessRegistry()
+        registry.mark_ready("test_index", {"properties": {}})
+        assert registry.is_ready("test_index", {"properties": {}})
+
+    def test_should_require_matching_mappings(self):
+        registry = ReadinessRegistry()
+        registry.mark_ready("test_index", {"properties": {}})
+        assert not registry.is_ready("test_index", {"properties": {"content": {"type": "text"}}})
+
+    def test_should_write_through_write_alias_by_default(self):
+        assert ReadinessRegistry().write_options("test_index") == {
+            "index": "test_index_write", "require_alias": True
+        }
+
+    def test_should_write_to_index_without_write_alias(self):
+        registry = ReadinessRegistry()
+        registry.mark_ready("test_index", {}, write_target="test_index")
+        assert registry.write_options("test_index") == {"index": "test_index"}
+
+    def test_should_invalidate_index(self):
+        registry = ReadinessRegistry()
+        registry.mark_ready("test_index", {})
+        registry.invalidate("test_index")
+        assert not registry.is_ready("test_index", {})
+
 
 @pytest.mark.skip("Slow tests.")
 class TestLifecycle:
@@ -61,9 +295,82 @@ class TestLifecycle:
         lifecycle.delete()
         assert not lifecycle.exists()
 
+    def test_should_keep_writing_to_index_with_other_mappings(self, index, document):
+        changed = Index(index.name, {"properties": {"content": {"type": "keyword"}}})
+
+        changed.lifecycle.create()
+        changed.add_document(document)
+
+        assert changed.document_exists(document.document_id)
+
+    def test_should_migrate_existing_index_with_other_mappings(self, index, document):
+        index.add_document(document)
+        changed = Index(index.name, {"properties": {"content": {"type": "keyword"}}})
+
+        changed.lifecycle.upgrade()
+
+        assert changed.lifecycle.live_mappings()["properties"]["content"]["type"] == "keyword"
+        assert changed.document_exists(document.document_id)
+
     def test_should_skip_creation_when_exists(self, index, document):
         index.add_document(document)
         index.refresh()
         assert index.document_count() == 1
         index.lifecycle.create()
         assert index.document_count() == 1
+
+
+class TestMigration:
+    @pytest.fixture
+    def index(self, index) -> Index:
+        index.lifecycle.delete()
+        index.lifecycle.create()
+        return index
+
+    def test_should_create_versioned_index_behind_aliases(self, index):
+        assert index.lifecycle.current_index() == "test_index_v1"
+
+    def test_should_keep_documents_when_migrating(self, index, document):
+        index.add_document(document)
+        index.refresh()
+
+        index.lifecycle.migrate({"properties": {"content": {"type": "keyword"}}})
+
+        assert index.lifecycle.current_index() == "test_index_v2"
+        assert index.document_exists(document.document_id)
+
+    def test_should_keep_writes_made_while_migrating(self, index, document):
+        migration = index.lifecycle.migrate({"properties": {"content": {"type": "text"}}}, wait=False)
+        index.add_document(document)
+        index.lifecycle.complete(migration)
+        index.refresh()
+
+        assert index.document_exists(document.document_id)
+
+    def test_should_read_and_update_source_while_migrating(self, index, document):
+        index.add_document(document)
+        migration = index.lifecycle.migrate({"properties": {"content": {"type": "text"}}}, wait=False)
+
+        stored = index.get_document(document.document_id)
+        stored.source["content"] = "updated content"
+        index.update_document(stored)
+        index.lifecycle.complete(migration)
+
+        assert index.get_document(document.document_id).source["content"] == "updated content"
+
+    def test_should_keep_deletes_made_while_migrating(self, index, document):
+        index.add_document(document)
+        migration = index.lifecycle.migrate({"properties": {"content": {"type": "text"}}}, wait=False)
+
+        index.client.delete(index=index.lifecycle.write_alias, id=document.document_id)
+        index.lifecycle.complete(migration)
+
+        assert not index.document_exists(document.document_id)
+
+    def test_should_not_create_write_index_implicitly(self, index, document):
+        index.lifecycle.delete()
+
+        with pytest.raises(NotFoundError):
+            index.add_document(document)
+
+        assert not index.lifecycle.exists()
@@ -1,17 +1,23 @@
 import pytest
 
 from conftest import INDEX_TEST_PREFIX
-from leaftracker.adapters.elastic_index import Document
+from leaftracker.adapters.document_cache import DocumentCache
+from leaftracker.adapters.documents import (
+    Document, TrackedSpecies, species_to_document, document_to_species, batch_to_document, document_to_batch
+)
+from leaftracker.adapters.elastic_index import RefreshPolicy
+from leaftracker.adapters.repository import ConcurrentModification
 from leaftracker.adapters.elastic_repository import (
-    SpeciesRepository, SPECIES_INDEX,
-    species_to_document, document_to_species
+    BatchRepository, SourceRepository, SpeciesRepository, BATCH_INDEX, SOURCE_INDEX, SPECIES_INDEX, name_query
+)
+from leaftracker.domain.model import (
+    Batch, BatchType, Source, SourceType, Species, Stock, StockSize, TaxonName
 )
-from leaftracker.domain.model import Species, TaxonName
 
 
 @pytest.fixture
 def repository() -> SpeciesRepository:
-    repo = SpeciesRepository(INDEX_TEST_PREFIX + SPECIES_INDEX)
+    repo = SpeciesRepository(INDEX_TEST_PREFIX + SPECIES_INDEX, refresh=RefreshPolicy.WAIT_FOR)
     repo.index.delete_all_documents()
     return repo
 
@@ -27,13 +33,28 @@ def test_should_add_taxon_history_to_document():
         document_id="species-0001",
         source={
             "scientific_names": [
-                {"genus": "Baumea", "species": "juncea"},
-                {"genus": "Machaerina", "species": "juncea"},
-            ]
+                {"genus": "Baumea", "species": "juncea", "full_name": "Baumea juncea"},
+                {"genus": "Machaerina", "species": "juncea", "full_name": "Machaerina juncea"},
+            ],
+            "current_name": "Machaerina juncea",
         }
     )
 
 
+def test_should_keep_subspecies_in_document():
+    species = Species(current_name="Banksia sessilis cygnorum", reference="species-0001")
+
+    restored = document_to_species(species_to_document(species))
+
+    assert restored.taxon_history.current() == TaxonName("Banksia sessilis cygnorum")
+
+
+def test_should_filter_exact_names_without_scoring():
+    assert name_query("Acacia  Saligna", include_previous=False) == {
+        "bool": {"filter": [{"term": {"current_name.normalised": "Acacia Saligna"}}]}
+    }
+
+
 def test_should_add_taxon_history_to_domain_object():
     document = Document(
         document_id="species-0001",
@@ -51,6 +72,46 @@ def test_should_add_taxon_history_to_domain_object():
     assert list(result.taxon_history.previous()) == [TaxonName("Baumea juncea")]
 
 
+@pytest.fixture
+def delivery() -> Batch:
+    batch = Batch(
+        source=Source("Trillion Trees", SourceType.NURSERY),
+        batch_type=BatchType.DELIVERY,
+        reference="batch-0001"
+    )
+    batch.add(Stock(species_ref="species-0001", quantity=20, size=StockSize.TUBE))
+    batch.add(Stock(species_ref="species-0001", quantity=5, size=StockSize.POT))
+    batch.add(Stock(species_ref="species-0002", quantity=10, size=StockSize.TUBE))
+    return batch
+
+
+def test_should_add_stock_to_document(delivery):
+    document = batch_to_document(delivery)
+
+    assert document.document_id == "batch-0001"
+    assert document.source["source"] == {"name": "Trillion Trees", "source_type": "NURSERY"}
+    assert document.source["batch_type"] == "DELIVERY"
+    assert document.source["stock"][1] == {"species_ref": "species-0001", "quantity": 5, "size": "POT"}
+
+
+def test_should_restore_batch_from_document(delivery):
+    batch = document_to_batch(batch_to_document(delivery))
+
+    assert batch == delivery
+    assert batch.source == delivery.source
+    assert batch.stock() == delivery.stock()
+
+
+def test_should_resolve_seen_species_and_treat_unreferenced_as_changed():
+    tracked = TrackedSpecies()
+    document = species_to_document(Species("Acacia saligna", reference="species-0001"))
+    seen = tracked.track(document)
+
+    assert tracked.resolve(document) is seen
+    assert not tracked.changed(seen)
+    assert tracked.changed(Species("Acacia cyclops"))
+
+
 class TestSpeciesRepository:
     def test_should_indicate_missing_document(self, repository):
         assert repository.get("Nothing") is None
@@ -59,3 +120,163 @@ class TestSpeciesRepository:
         repository.add(saligna)
         repository.rollback()
         assert not repository.added()
+
+    def test_should_get_many(self, repository, saligna, dentifera):
+        repository.add(saligna)
+        repository.add(dentifera)
+        repository.commit()
+
+        found = repository.get_many([saligna.reference, "Nothing", dentifera.reference])
+
+        assert found == [saligna, dentifera]
+
+    def test_should_commit_changes_to_retrieved_species(self, repository, saligna):
+        repository.add(saligna)
+        repository.commit()
+
+        species = repository.get(saligna.reference)
+        species.taxon_history.new_current_name("Acacia cyclops")
+        repository.commit()
+        repository.rollback()
+
+        renamed = repository.get(saligna.reference)
+        assert renamed.taxon_history.current() == TaxonName("Acacia cyclops")
+
+    def test_should_return_same_species_within_transaction(self, repository, saligna):
+        repository.add(saligna)
+        repository.commit()
+
+        assert repository.get(saligna.reference) is repository.get(saligna.reference)
+
+    def test_should_read_through_cache(self, saligna):
+        cache = DocumentCache()
+        repository = SpeciesRepository(INDEX_TEST_PREFIX + SPECIES_INDEX, cache=cache)
+        repository.add(saligna)
+        repository.commit()
+
+        repository.get(saligna.reference)
+        repository.rollback()
+
+        assert len(cache) == 1
+        assert repository.get(saligna.reference) == saligna
+
+    def test_should_invalidate_cache_on_commit(self, saligna):
+        cache = DocumentCache()
+        repository = SpeciesRepository(INDEX_TEST_PREFIX + SPECIES_INDEX, cache=cache)
+        repository.add(saligna)
+        repository.commit()
+
+        species = repository.get(saligna.reference)
+        species.taxon_history.new_current_name("Acacia cyclops")  # type: ignore
+        repository.commit()
+
+        assert len(cache) == 0
+
+    def test_should_read_own_writes_without_refresh(self, saligna):
+        repository = SpeciesRepository(INDEX_TEST_PREFIX + SPECIES_INDEX)
+        repository.add(saligna)
+        repository.commit()
+        repository.rollback()
+
+        assert repository.get(saligna.reference) == saligna
+        assert repository.get_many([saligna.reference]) == [saligna]
+
+    def test_should_not_rewrite_unchanged_species(self, repository, saligna):
+        repository.add(saligna)
+        repository.commit()
+        repository.rollback()
+
+        version = repository.index.get_version(saligna.reference)
+        repository.get(saligna.reference)
+        repository.commit()
+
+        assert repository.pending() == []
+        assert repository.index.get_version(saligna.reference) == version
+
+    def test_should_detect_concurrent_modification(self, repository, saligna):
+        repository.add(saligna)
+        repository.commit()
+
+        other = SpeciesRepository(INDEX_TEST_PREFIX + SPECIES_INDEX)
+        theirs = other.get(saligna.reference)
+        ours = repository.get(saligna.reference)
+
+        theirs.taxon_history.new_current_name("Acacia cyclops")  # type: ignore
+        other.commit()
+
+        ours.taxon_history.new_current_name("Acacia lasiocalyx")
+
+        with pytest.raises(ConcurrentModification):
+            repository.commit()
+
+    def test_should_iterate_over_all_species(self, repository, saligna, dentifera):
+        repository.add(saligna)
+        repository.add(dentifera)
+        repository.commit()
+
+        assert set(repository.iter_all(page_size=1)) == {saligna, dentifera}
+
+    def test_should_find_by_exact_name(self, repository, saligna, dentifera):
+        repository.add(saligna)
+        repository.add(dentifera)
+        repository.commit()
+        repository.rollback()
+
+        assert repository.find_by_name("acacia SALIGNA") == [saligna]
+
+    def test_should_find_by_name_prefix(self, repository, saligna, dentifera):
+        repository.add(saligna)
+        repository.add(dentifera)
+        repository.commit()
+
+        assert set(repository.find_by_name("acacia", prefix=True)) == {saligna, dentifera}
+        assert repository.find_by_name("acacia sal", prefix=True) == [saligna]
+
+    def test_should_find_by_previous_name(self, repository, saligna):
+        saligna.taxon_history.new_current_name("Acacia cyclops")
+        repository.add(saligna)
+        repository.commit()
+
+        assert repository.find_by_name("Acacia saligna") == [saligna]
+        assert repository.find_by_name("Acacia saligna", include_previous=False) == []
+
+
+@pytest.fixture
+def batches() -> BatchRepository:
+    repo = BatchRepository(INDEX_TEST_PREFIX + BATCH_INDEX, refresh=RefreshPolicy.WAIT_FOR)
+    repo.index.delete_all_documents()
+    return repo
+
+
+class TestBatchRepository:
+    def test_should_assign_reference_when_added(self, batches):
+        batch = Batch(Source("Habitat Links", SourceType.PROGRAM), BatchType.ORDER)
+        assert batches.add(batch) == batch.reference
+
+    def test_should_get_committed_batch(self, batches, delivery):
+        batches.add(delivery)
+        batches.commit()
+
+        batch = batches.get(delivery.reference)
+        assert batch.stock() == delivery.stock()  # type: ignore
+
+    def test_should_indicate_missing_batch(self, batches):
+        assert batches.get("Nothing") is None
+
+    def test_should_aggregate_quantities(self, batches, delivery):
+        batches.add(delivery)
+        batches.commit()
+
+        assert batches.quantity("species-0001") == 25
+        assert batches.quantity("species-0001", size=StockSize.POT) == 5
+        assert batches.quantity("species-0001", batch_type=BatchType.ORDER) == 0
+        assert batches.quantities() == {"species-0001": 25, "species-0002": 10}
+
+
+class TestSourceRepository:
+    def test_should_get_committed_source(self):
+        sources = SourceRepository(INDEX_TEST_PREFIX + SOURCE_INDEX)
+        sources.add(Source("Trillion Trees", SourceType.NURSERY))
+        sources.commit()
+
+        assert sources.get("Trillion Trees").source_type == SourceType.NURSERY  # type: ignore
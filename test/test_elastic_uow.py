@@ -2,6 +2,9 @@ import pytest
 
 from conftest import INDEX_TEST_PREFIX
 from leaftracker.adapters.elastic_repository import SPECIES_INDEX
+from leaftracker.adapters.instrumentation import EventLog
+from leaftracker.domain.model import BatchType
+from leaftracker.service_layer import services
 from leaftracker.service_layer.elastic_uow import ElasticUnitOfWork
 
 
@@ -46,6 +49,17 @@ def test_should_add_two_species(uow, saligna, dentifera):
     assert uow.species().index.document_count() == 2
 
 
+def test_should_assign_references_in_bulk(uow, saligna, dentifera):
+    with uow:
+        uow.species().add(saligna)
+        uow.species().add(dentifera)
+        uow.commit()
+
+    assert saligna.reference is not None
+    assert dentifera.reference is not None
+    assert uow.species().get(dentifera.reference) == dentifera
+
+
 def test_should_clear_queue_on_rollback(uow, saligna):
     with uow:
         uow.species().add(saligna)
@@ -65,3 +79,32 @@ def test_should_clear_queue_after_commit(uow, saligna):
         uow.species().add(saligna)
         uow.commit()
         assert not uow.species().added()
+
+
+def test_should_share_client_between_units_of_work():
+    first = ElasticUnitOfWork(INDEX_TEST_PREFIX)
+    second = ElasticUnitOfWork(INDEX_TEST_PREFIX)
+    assert first.species().index.client is second.species().index.client
+
+
+def test_should_add_batch_from_source(uow):
+    services.add_nursery("Trillion Trees", uow)
+    reference = services.add_delivery("Trillion Trees", uow)
+
+    with uow:
+        assert uow.batches().get(reference).batch_type == BatchType.DELIVERY  # type: ignore
+
+
+def test_should_summarise_operations_on_exit(saligna, dentifera):
+    log = EventLog()
+    uow = ElasticUnitOfWork(INDEX_TEST_PREFIX, sink=log)
+
+    with uow:
+        uow.species().add(saligna)
+        uow.species().add(dentifera)
+        uow.commit()
+
+    assert uow.summary["index.bulk"].documents == 2
+    assert uow.summary["uow.commit"].calls == 1
+    assert "index.index" not in uow.summary
+    assert log.named("uow.commit")
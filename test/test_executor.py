@@ -0,0 +1,125 @@
+from threading import Thread
+
+import pytest
+
+from leaftracker.adapters.elastic_index import readiness
+from leaftracker.adapters.elastic_repository import (
+    BATCH_INDEX, BATCH_MAPPINGS, SOURCE_INDEX, SOURCE_MAPPINGS, SPECIES_INDEX, SPECIES_MAPPINGS, SPECIES_SETTINGS
+)
+from leaftracker.domain.model import Species
+from leaftracker.service_layer import services
+from leaftracker.service_layer.elastic_uow import ElasticUnitOfWork
+from leaftracker.service_layer.executor import ServiceExecutor
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+from leaftracker.service_layer.services import ServiceError
+
+FAKE_PREFIX = "fake_"
+
+
+class FakeElasticsearch:
+    def __init__(self):
+        self.indexed: list[str] = []
+
+    def index(self, index: str, id: str | None, document: dict, **kwargs) -> dict:
+        self.indexed.append(document["current_name"])
+        return {"_id": f"species-{len(self.indexed):04}", "_primary_term": 1, "_seq_no": len(self.indexed)}
+
+
+@pytest.fixture
+def fake_elastic_uow():
+    indices: list[tuple[str, dict, dict | None]] = [
+        (FAKE_PREFIX + SPECIES_INDEX, SPECIES_MAPPINGS, SPECIES_SETTINGS),
+        (FAKE_PREFIX + BATCH_INDEX, BATCH_MAPPINGS, None),
+        (FAKE_PREFIX + SOURCE_INDEX, SOURCE_MAPPINGS, None),
+    ]
+    for name, mappings, settings in indices:
+        readiness.mark_ready(name, mappings, settings)
+
+    yield ElasticUnitOfWork(FAKE_PREFIX, client=FakeElasticsearch(), collect_summary=True)  # type: ignore
+
+    for name, _, _ in indices:
+        readiness.invalidate(name)
+
+
+def test_should_keep_pending_changes_per_thread():
+    uow = MemoryUnitOfWork()
+    uow.species().add(Species("Acacia saligna"))
+
+    seen = []
+    thread = Thread(target=lambda: seen.append(list(uow.species().added())))
+    thread.start()
+    thread.join()
+
+    assert seen == [[]]
+    assert len(uow.species().added()) == 1
+
+
+def test_should_run_services_on_thread_pool():
+    uow = MemoryUnitOfWork()
+
+    with ServiceExecutor(uow, workers=4) as executor:
+        outcomes = executor.map(services.add_species, [(f"Genus species{number}",) for number in range(50)])
+
+    assert all(outcome.ok for outcome in outcomes)
+    assert len({outcome.result for outcome in outcomes}) == 50
+    assert outcomes[0].args == ("Genus species0",)
+
+
+def test_should_collect_errors_per_call():
+    uow = MemoryUnitOfWork()
+    reference = services.add_species("Acacia saligna", uow)
+
+    with ServiceExecutor(uow) as executor:
+        outcomes = executor.map(services.rename_species, [
+            (reference, "Acacia cyclops"),
+            ("species-9999", "Acacia lasiocalyx"),
+        ])
+
+    assert outcomes[0].ok
+    assert isinstance(outcomes[1].error, ServiceError)
+
+
+def test_should_submit_single_service_call():
+    uow = MemoryUnitOfWork()
+
+    with ServiceExecutor(uow) as executor:
+        reference = executor.submit(services.add_species, "Acacia saligna").result()
+
+    assert uow.species().get(reference) is not None
+
+
+def test_should_keep_elastic_pending_changes_and_summary_per_thread(fake_elastic_uow):
+    uow = fake_elastic_uow
+    seen = []
+
+    def commit_in_thread():
+        with uow:
+            uow.species().add(Species("Acacia cyclops"))
+            seen.append(list(uow.species().added()))
+            uow.commit()
+        seen.append(uow.summary["uow.commit"].documents)
+
+    with uow:
+        uow.species().add(Species("Acacia saligna"))
+
+        thread = Thread(target=commit_in_thread)
+        thread.start()
+        thread.join()
+
+        assert len(uow.species().added()) == 1
+        uow.commit()
+
+    assert [str(species.taxon_history.current()) for species in seen[0]] == ["Acacia cyclops"]
+    assert seen[1] == 1
+    assert uow.summary["uow.commit"].calls == 1
+    assert uow.summary["index.index"].documents == 1
+
+
+def test_should_not_summarise_elastic_operations_by_default(fake_elastic_uow):
+    uow = ElasticUnitOfWork(FAKE_PREFIX, client=FakeElasticsearch())  # type: ignore
+
+    with uow:
+        uow.species().add(Species("Acacia saligna"))
+        uow.commit()
+
+    assert uow.summary == {}
@@ -0,0 +1,185 @@
+import io
+
+import pytest
+
+from leaftracker.adapters.repository import BulkFailure, BulkWriteError
+from leaftracker.domain.model import BatchType, StockSize, TaxonName
+from leaftracker.service_layer import services
+from leaftracker.service_layer.importer import (
+    ChunkSizer, Rejected, csv_rows, import_manifest, import_species, jsonl_rows
+)
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+
+SPECIES_CSV = """current_name,previous_names
+Machaerina juncea,Baumea juncea
+Acacia saligna,
+Not-a-name,
+Banksia sessilis cygnorum,Dryandra sessilis cygnorum;Dryandra sessilis
+"""
+
+
+def test_should_read_csv_rows():
+    rows = list(csv_rows(io.StringIO(SPECIES_CSV)))
+
+    assert rows[0].line == 2
+    assert rows[0].previous_names == ["Baumea juncea"]
+    assert rows[3].previous_names == ["Dryandra sessilis cygnorum", "Dryandra sessilis"]
+
+
+def test_should_reject_invalid_json_lines():
+    lines = io.StringIO('{"current_name": "Acacia saligna"}\n\n{not json\n')
+
+    rows = list(jsonl_rows(lines))
+
+    assert rows[0].current_name == "Acacia saligna"  # type: ignore
+    assert isinstance(rows[1], Rejected)
+    assert rows[1].line == 3
+
+
+def test_should_reject_json_lines_that_are_not_species_objects():
+    lines = io.StringIO('"Acacia saligna"\n{"current_name": "Acacia saligna", "previous_names": "Acacia cyclops"}\n')
+
+    rows = list(jsonl_rows(lines))
+
+    assert rows == [
+        Rejected(1, "Expected a JSON object"),
+        Rejected(2, "previous_names must be a list of names"),
+    ]
+
+
+class PartlyFailingUnitOfWork(MemoryUnitOfWork):
+    def commit(self) -> None:
+        self.species().added().pop(1)
+        super().commit()
+        raise BulkWriteError([BulkFailure(position=1, document_id=None, status=400, reason="mapper_parsing_exception")])
+
+
+def test_should_only_reject_rows_that_failed_to_commit():
+    uow = MemoryUnitOfWork()
+
+    report = import_species(io.StringIO(SPECIES_CSV), lambda: PartlyFailingUnitOfWork(uow.store), chunk_size=50)
+
+    assert report.imported == 2
+    assert [rejection.line for rejection in report.rejections] == [4, 3]
+    assert report.rejections[1].reason == "Commit failed: mapper_parsing_exception"
+
+    with uow:
+        assert uow.species().find_by_name("Acacia saligna") == []
+
+
+def test_should_import_species_in_chunks():
+    uow = MemoryUnitOfWork()
+
+    report = import_species(io.StringIO(SPECIES_CSV), lambda: MemoryUnitOfWork(uow.store),
+                            workers=2, chunk_size=1)
+
+    assert report.rows == 4
+    assert report.imported == 3
+    assert [rejection.line for rejection in report.rejections] == [4]
+
+    with uow:
+        juncea = uow.species().find_by_name("Machaerina juncea")[0]
+        assert list(juncea.taxon_history.previous()) == [TaxonName("Baumea juncea")]
+
+
+def test_should_reject_rows_without_current_name():
+    report = import_species(io.StringIO('{"previous_names": ["Acacia saligna"]}\n'), MemoryUnitOfWork,
+                            file_format="jsonl")
+
+    assert report.rejected == 1
+    assert report.imported == 0
+
+
+def test_should_import_large_stream_with_bounded_chunks():
+    lines = (f'{{"current_name": "Genus species{number}"}}\n' for number in range(5000))
+    uow = MemoryUnitOfWork()
+
+    report = import_species(lines, lambda: MemoryUnitOfWork(uow.store), file_format="jsonl", chunk_size=100)
+
+    assert report.imported == 5000
+    assert report.rows_per_second > 0
+    assert len(list(uow.species().iter_all())) == 5000
+
+
+def test_should_grow_chunks_when_commits_are_fast():
+    sizer = ChunkSizer(initial=100, target_seconds=1.0)
+    sizer.observe(100, 0.1)
+    assert sizer.size == 200
+
+
+def test_should_shrink_chunks_when_commits_are_slow():
+    sizer = ChunkSizer(initial=100, minimum=10, target_seconds=1.0)
+    sizer.observe(100, 3.0)
+    assert sizer.size == 50
+
+
+def test_should_ignore_partial_chunks():
+    sizer = ChunkSizer(initial=100, target_seconds=1.0)
+    sizer.observe(10, 0.1)
+    assert sizer.size == 100
+
+
+MANIFEST_CSV = """batch,source,batch_type,species,quantity,size
+TT-001,Trillion Trees,delivery,Acacia saligna,20,tube
+TT-001,Trillion Trees,delivery,Machaerina juncea,5,pot
+TT-001,Trillion Trees,delivery,Acacia nowhere,5,pot
+TT-002,Trillion Trees,order,Baumea juncea,10,tube
+TT-002,Trillion Trees,order,Acacia saligna,many,tube
+TT-003,Nobody,pickup,Acacia saligna,1,tube
+"""
+
+
+@pytest.fixture
+def stocked_uow() -> MemoryUnitOfWork:
+    uow = MemoryUnitOfWork()
+    services.add_nursery("Trillion Trees", uow)
+    services.add_species("Acacia saligna", uow)
+    services.rename_species(services.add_species("Baumea juncea", uow), "Machaerina juncea", uow)
+    return uow
+
+
+def test_should_build_batches_from_manifest(stocked_uow):
+    report = import_manifest(io.StringIO(MANIFEST_CSV), stocked_uow, chunk_lines=3)
+
+    assert report.rows == 6
+    assert report.batches == 2
+    assert report.imported == 3
+    assert [rejection.line for rejection in report.rejections] == [4, 6, 7]
+
+    with stocked_uow:
+        first = stocked_uow.batches().get("batch-0001")
+        second = stocked_uow.batches().get("batch-0002")
+
+        assert first.external_id == "TT-001"  # type: ignore
+        assert first.batch_type == BatchType.DELIVERY  # type: ignore
+        assert first.quantity("species-0001") == 20  # type: ignore
+        assert second.quantity_of_size("species-0002", StockSize.TUBE) == 10  # type: ignore
+
+
+def test_should_group_manifest_lines_that_are_not_contiguous(stocked_uow):
+    manifest = """batch,source,batch_type,species,quantity,size
+B1,Trillion Trees,delivery,Acacia saligna,20,tube
+B2,Trillion Trees,delivery,Acacia saligna,5,pot
+B1,Trillion Trees,delivery,Machaerina juncea,5,pot
+"""
+
+    report = import_manifest(io.StringIO(manifest), stocked_uow)
+
+    assert report.batches == 2
+
+    with stocked_uow:
+        first = stocked_uow.batches().get("batch-0001")
+
+        assert first.external_id == "B1"  # type: ignore
+        assert first.quantity("species-0001") == 20  # type: ignore
+        assert first.quantity("species-0002") == 5  # type: ignore
+
+
+def test_should_explain_rejected_manifest_lines(stocked_uow):
+    report = import_manifest(io.StringIO(MANIFEST_CSV), stocked_uow)
+
+    assert [rejection.reason for rejection in report.rejections] == [
+        "Unknown species: 'Acacia nowhere'",
+        "Quantity is not a number: 'many'",
+        "No such source: 'Nobody'",
+    ]
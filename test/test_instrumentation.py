@@ -0,0 +1,85 @@
+import pytest
+
+from leaftracker.adapters.instrumentation import (
+    NULL_SINK, Event, EventLog, Measurement, OperationTotals, Summary, emit, payload_size
+)
+
+
+def test_should_disable_null_sink():
+    assert not NULL_SINK.enabled
+
+
+def test_should_total_events_by_name():
+    summary = Summary()
+    summary.record(Event("index.bulk", "species", documents=500, bytes=1000, duration=0.5))
+    summary.record(Event("index.bulk", "species", documents=20, bytes=40, duration=0.25))
+    summary.record(Event("index.get", "species", documents=1))
+
+    assert summary.totals()["index.bulk"] == OperationTotals(calls=2, documents=520, bytes=1040, duration=0.75)
+    assert summary.calls() == 3
+
+
+def test_should_forward_events():
+    log = EventLog()
+    summary = Summary(log)
+    summary.record(Event("index.get", "species"))
+
+    assert log.named("index.get") == [Event("index.get", "species")]
+
+
+def test_should_collect_without_forwarding():
+    summary = Summary(NULL_SINK)
+    emit(summary, "index.search", "species", started=0.0, documents=3, body={"match_all": {}})
+
+    assert summary.enabled
+    assert summary.totals()["index.search"].documents == 3
+    assert summary.totals()["index.search"].bytes == 0
+
+
+def test_should_measure_payload_for_forwarded_sink():
+    summary = Summary(EventLog())
+    emit(summary, "index.search", "species", started=0.0, body={"match_all": {}})
+
+    assert summary.totals()["index.search"].bytes == len('{"match_all": {}}')
+
+
+def test_should_clear_summary():
+    summary = Summary()
+    summary.record(Event("index.get", "species"))
+    summary.clear()
+
+    assert summary.totals() == {}
+
+
+def test_should_measure_bulk_payload_by_line():
+    assert payload_size([{"index": {}}, {"a": 1}]) == len('{"index": {}}') + len('{"a": 1}') + 2
+
+
+def test_should_emit_event_with_duration():
+    log = EventLog()
+    emit(log, "index.search", "species", started=0.0, documents=3, body={"match_all": {}})
+
+    event = log.events[0]
+    assert event.documents == 3
+    assert event.bytes == len('{"match_all": {}}')
+    assert event.duration > 0
+
+
+def test_should_record_measurement_on_exit():
+    log = EventLog()
+
+    with Measurement(log, "index.search", "species", body={"match_all": {}}) as measured:
+        measured.documents = 2
+
+    assert log.events[0].documents == 2
+    assert log.events[0].bytes == len('{"match_all": {}}')
+
+
+def test_should_record_measurement_when_call_fails():
+    log = EventLog()
+
+    with pytest.raises(KeyError):
+        with Measurement(log, "index.get", "species", documents=1):
+            raise KeyError("missing")
+
+    assert [event.name for event in log.events] == ["index.get"]
@@ -0,0 +1,80 @@
+import pytest
+
+from leaftracker.domain.inventory import Codes, Inventory
+from leaftracker.domain.model import Batch, BatchType, Source, SourceType, Stock, StockSize
+
+BANKSIA = "Banksia littoralis"
+HAKEA = "Hakea varia"
+
+
+@pytest.fixture
+def nursery() -> Source:
+    return Source("Trillion Trees", SourceType.NURSERY)
+
+
+@pytest.fixture
+def inventory(nursery) -> Inventory:
+    inventory = Inventory()
+
+    delivery = inventory.batch(nursery, BatchType.DELIVERY, "batch-0001")
+    delivery.add(Stock(species_ref=BANKSIA, quantity=20, size=StockSize.TUBE))
+    delivery.add(Stock(species_ref=HAKEA, quantity=5, size=StockSize.POT))
+
+    order = inventory.batch(nursery, BatchType.ORDER, "batch-0002")
+    order.add(Stock(species_ref=BANKSIA, quantity=10, size=StockSize.POT))
+
+    return inventory
+
+
+def test_should_encode_each_value_once():
+    codes = Codes()
+    assert [codes.encode(BANKSIA), codes.encode(HAKEA), codes.encode(BANKSIA)] == [0, 1, 0]
+    assert codes.decode(1) == HAKEA
+    assert len(codes) == 2
+
+
+def test_should_total_across_batches(inventory):
+    assert inventory.totals() == {BANKSIA: 30, HAKEA: 5}
+
+
+def test_should_total_by_batch_type(inventory):
+    assert inventory.totals(BatchType.ORDER) == {BANKSIA: 10}
+
+
+def test_should_total_by_size(inventory):
+    assert inventory.totals_by_size() == {
+        (BANKSIA, StockSize.TUBE): 20,
+        (HAKEA, StockSize.POT): 5,
+        (BANKSIA, StockSize.POT): 10,
+    }
+
+
+def test_should_keep_batch_api(nursery):
+    batch = Inventory().batch(nursery, BatchType.PICKUP)
+    batch.add(Stock(species_ref=BANKSIA, quantity=20, size=StockSize.TUBE))
+    batch.add(Stock(species_ref=BANKSIA, quantity=10, size=StockSize.POT))
+
+    assert batch.quantity(BANKSIA) == 30
+    assert batch.quantity_of_size(BANKSIA, StockSize.POT) == 10
+    assert batch.species() == [BANKSIA]
+    assert batch.stock() == [
+        Stock(species_ref=BANKSIA, quantity=20, size=StockSize.TUBE),
+        Stock(species_ref=BANKSIA, quantity=10, size=StockSize.POT),
+    ]
+
+
+def test_should_load_existing_batches(nursery):
+    batch = Batch(nursery, BatchType.DELIVERY, "batch-0001")
+    batch.add(Stock(species_ref=HAKEA, quantity=5, size=StockSize.POT))
+
+    inventory = Inventory.from_batches([batch])
+
+    assert len(inventory) == 1
+    assert inventory.totals() == {HAKEA: 5}
+
+
+def test_should_total_by_size_and_batch_type(inventory):
+    assert inventory.totals_by_size(BatchType.DELIVERY) == {
+        (BANKSIA, StockSize.TUBE): 20,
+        (HAKEA, StockSize.POT): 5,
+    }
@@ -0,0 +1,152 @@
+import pytest
+
+from leaftracker.adapters.repository import ConcurrentModification
+from leaftracker.domain.model import Batch, BatchType, Source, SourceType, Stock, StockSize, TaxonName
+from leaftracker.service_layer import services
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+from leaftracker.service_layer.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def uow() -> MemoryUnitOfWork:
+    return MemoryUnitOfWork()
+
+
+def test_should_implement_unit_of_work(uow):
+    checked: UnitOfWork = uow
+    assert checked is uow
+
+
+def test_should_rollback_if_not_committed(uow, saligna):
+    with uow:
+        uow.species().add(saligna)
+
+    assert saligna.reference is None
+    assert list(uow.species().iter_all()) == []
+
+
+def test_should_return_none_for_missing_species(uow):
+    with uow:
+        assert uow.species().get("missing") is None
+
+
+def test_should_assign_references_on_commit(uow, saligna, dentifera):
+    with uow:
+        uow.species().add(saligna)
+        uow.species().add(dentifera)
+        uow.commit()
+
+    assert [saligna.reference, dentifera.reference] == ["species-0001", "species-0002"]
+
+
+def test_should_discard_uncommitted_changes(uow, saligna):
+    with uow:
+        uow.species().add(saligna)
+        uow.commit()
+
+    with uow:
+        uow.species().get(saligna.reference).taxon_history.new_current_name("Acacia cyclops")  # type: ignore
+
+    with uow:
+        species = uow.species().get(saligna.reference)
+        assert species.taxon_history.current() == TaxonName("Acacia saligna")  # type: ignore
+
+
+def test_should_commit_changes_to_retrieved_species(uow, saligna):
+    services.add_species("Acacia saligna", uow)
+    services.rename_species("species-0001", "Acacia cyclops", uow)
+
+    with uow:
+        assert uow.species().find_by_name("acacia cyclops")[0].reference == "species-0001"
+        assert uow.species().find_by_name("Acacia saligna", include_previous=False) == []
+        assert len(uow.species().find_by_name("acacia", prefix=True)) == 1
+
+
+def test_should_share_store_between_units_of_work(uow):
+    reference = services.add_species("Acacia saligna", uow)
+    other = MemoryUnitOfWork(uow.store)
+
+    with other:
+        assert other.species().get(reference) is not None
+
+
+def test_should_detect_concurrent_modification(uow):
+    reference = services.add_species("Acacia saligna", uow)
+    other = MemoryUnitOfWork(uow.store)
+
+    with uow, other:
+        ours = uow.species().get(reference)
+        theirs = other.species().get(reference)
+
+        theirs.taxon_history.new_current_name("Acacia cyclops")  # type: ignore
+        other.commit()
+
+        ours.taxon_history.new_current_name("Acacia lasiocalyx")  # type: ignore
+        with pytest.raises(ConcurrentModification):
+            uow.commit()
+
+
+def test_should_only_commit_changed_species(uow):
+    unchanged = services.add_species("Acacia saligna", uow)
+    changed = services.add_species("Baumea juncea", uow)
+    version = uow.store.species[unchanged].version
+
+    with uow:
+        uow.species().get(unchanged)
+        uow.species().get(changed).rename("Machaerina juncea")  # type: ignore
+        assert uow.species().pending() == [uow.species().get(changed)]
+        uow.commit()
+
+    assert uow.store.species[unchanged].version == version
+
+
+def test_should_not_conflict_on_species_only_read(uow):
+    reference = services.add_species("Acacia saligna", uow)
+    other = MemoryUnitOfWork(uow.store)
+
+    with uow:
+        uow.species().get(reference)
+        services.rename_species(reference, "Acacia cyclops", other)
+        uow.commit()
+
+    with uow:
+        assert uow.species().get(reference).taxon_history.current() == TaxonName("Acacia cyclops")  # type: ignore
+
+
+def test_should_not_commit_sources_when_species_conflict(uow):
+    reference = services.add_species("Acacia saligna", uow)
+    other = MemoryUnitOfWork(uow.store)
+
+    with uow:
+        species = uow.species().get(reference)
+        services.rename_species(reference, "Acacia cyclops", other)
+        species.rename("Acacia lasiocalyx")  # type: ignore
+
+        uow.sources().add(Source("Trillion Trees", SourceType.NURSERY))
+        with pytest.raises(ConcurrentModification):
+            uow.commit()
+
+        assert uow.sources().get("Trillion Trees") is None
+
+
+def test_should_track_batches_in_transaction(uow):
+    services.add_nursery("Trillion Trees", uow)
+
+    with uow:
+        batch = Batch(uow.sources().get("Trillion Trees"), BatchType.DELIVERY)  # type: ignore
+        batch.add(Stock("species-0001", 20, StockSize.TUBE))
+        reference = uow.batches().add(batch)
+
+    with uow:
+        assert uow.batches().get(reference) is None
+
+
+def test_should_return_copy_of_committed_batch(uow):
+    services.add_nursery("Trillion Trees", uow)
+    reference = services.add_delivery("Trillion Trees", uow)
+
+    with uow:
+        uow.batches().get(reference).add(Stock("species-0001", 20, StockSize.TUBE))  # type: ignore
+
+    with uow:
+        assert uow.batches().get(reference).stock() == []  # type: ignore
@@ -0,0 +1,195 @@
+import threading
+
+import pytest
+
+from leaftracker.domain.events import BatchAdded, Event, SpeciesAdded, SpeciesRenamed, StockAdded
+from leaftracker.domain.model import Batch, BatchType, Source, SourceType, Species, Stock, StockSize
+from leaftracker.service_layer import services
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+from leaftracker.service_layer.messagebus import HandlerErrors, MessageBus, coalesce
+
+
+class Recorder:
+    def __init__(self):
+        self.batches: list[list[Event]] = []
+        self.threads: set[str] = set()
+
+    def __call__(self, events: list[Event]):
+        self.batches.append(events)
+        self.threads.add(threading.current_thread().name)
+
+    @property
+    def events(self) -> list[Event]:
+        return [event for batch in self.batches for event in batch]
+
+
+@pytest.fixture
+def recorder() -> Recorder:
+    return Recorder()
+
+
+@pytest.fixture
+def bus(recorder) -> MessageBus:
+    bus = MessageBus()
+    for event_type in (SpeciesAdded, SpeciesRenamed, BatchAdded, StockAdded):
+        bus.subscribe(event_type, recorder)
+    return bus
+
+
+@pytest.fixture
+def uow(bus) -> MemoryUnitOfWork:
+    return MemoryUnitOfWork(bus=bus)
+
+
+def test_should_publish_species_added_with_reference(uow, recorder):
+    reference = services.add_species("Acacia saligna", uow)
+
+    assert recorder.events == [SpeciesAdded(reference, "Acacia saligna")]
+
+
+def test_should_publish_species_renamed(uow, recorder):
+    reference = services.add_species("Acacia saligna", uow)
+    services.rename_species(reference, "Acacia bivenosa", uow)
+
+    assert recorder.events[-1] == SpeciesRenamed(reference, "Acacia saligna", "Acacia bivenosa")
+
+
+def test_should_not_publish_without_commit(uow, recorder):
+    with uow:
+        uow.batches().add(Batch(Source("Trillion Trees", SourceType.NURSERY), BatchType.ORDER))
+
+    assert recorder.events == []
+
+
+def test_should_publish_batch_and_stock_added(uow, recorder):
+    services.add_nursery("Trillion Trees", uow)
+    batch_ref = services.add_delivery("Trillion Trees", uow)
+
+    with uow:
+        batch = Batch(Source("Trillion Trees", SourceType.NURSERY), BatchType.ORDER)
+        batch.add(Stock("species-0001", 10, StockSize.TUBE))
+        uow.batches().add(batch)
+        uow.commit()
+
+    assert recorder.events == [
+        BatchAdded(batch_ref, "Trillion Trees", BatchType.DELIVERY),
+        BatchAdded(batch.reference, "Trillion Trees", BatchType.ORDER),
+        StockAdded(batch.reference, "species-0001", 10, StockSize.TUBE),
+    ]
+
+
+def test_should_not_publish_events_for_loaded_aggregates(uow, recorder):
+    with uow:
+        batch = Batch(Source("Trillion Trees", SourceType.NURSERY), BatchType.ORDER)
+        batch.add(Stock("species-0001", 10, StockSize.TUBE))
+        batch_ref = uow.batches().add(batch)
+        uow.commit()
+
+    recorder.batches.clear()
+
+    with uow:
+        uow.batches().get(batch_ref)
+        uow.species().add(Species("Acacia saligna", reference="species-0001"))
+        uow.commit()
+
+    assert recorder.events == []
+
+
+def test_should_coalesce_renames_of_the_same_species():
+    events = coalesce([
+        SpeciesRenamed("species-0001", "Acacia saligna", "Acacia bivenosa"),
+        SpeciesAdded("species-0002", "Hakea varia"),
+        SpeciesRenamed("species-0001", "Acacia bivenosa", "Acacia cyclops"),
+    ])
+
+    assert events == [
+        SpeciesAdded("species-0002", "Hakea varia"),
+        SpeciesRenamed("species-0001", "Acacia saligna", "Acacia cyclops"),
+    ]
+
+
+def test_should_keep_repeated_stock_events():
+    stock = StockAdded("batch-0001", "species-0001", 10, StockSize.TUBE)
+    assert coalesce([stock, stock]) == [stock, stock]
+
+
+def test_should_dispatch_in_batches(recorder):
+    bus = MessageBus(batch_size=2)
+    bus.subscribe(SpeciesAdded, recorder)
+
+    bus.publish([SpeciesAdded(f"species-{n}", "Hakea varia") for n in range(5)])
+
+    assert [len(batch) for batch in recorder.batches] == [2, 2, 1]
+
+
+def test_should_batch_interleaved_event_types_together(bus, recorder):
+    first = StockAdded("batch-0001", "species-0001", 10, StockSize.TUBE)
+    second = StockAdded("batch-0001", "species-0002", 5, StockSize.POT)
+
+    bus.publish([first, SpeciesAdded("species-0003", "Hakea varia"), second,
+                 SpeciesAdded("species-0004", "Acacia saligna")])
+
+    assert recorder.batches == [
+        [first, second],
+        [SpeciesAdded("species-0003", "Hakea varia"), SpeciesAdded("species-0004", "Acacia saligna")],
+    ]
+
+
+def test_should_only_dispatch_subscribed_events(recorder):
+    bus = MessageBus()
+    bus.subscribe(BatchAdded, recorder)
+
+    bus.publish([SpeciesAdded("species-0001", "Hakea varia"),
+                 BatchAdded("batch-0001", "Trillion Trees", BatchType.ORDER)])
+
+    assert recorder.events == [BatchAdded("batch-0001", "Trillion Trees", BatchType.ORDER)]
+
+
+def fail(events):
+    raise ValueError("projection failed")
+
+
+def test_should_raise_handler_errors_after_dispatching(recorder):
+    bus = MessageBus()
+    bus.subscribe(SpeciesAdded, fail)
+    bus.subscribe(SpeciesAdded, recorder)
+
+    with pytest.raises(HandlerErrors) as raised:
+        bus.publish([SpeciesAdded("species-0001", "Hakea varia")])
+
+    assert [str(error) for error in raised.value.errors] == ["projection failed"]
+    assert recorder.events == [SpeciesAdded("species-0001", "Hakea varia")]
+
+
+def test_should_log_and_bound_background_handler_errors(caplog):
+    with MessageBus(background=True, linger=0.01, max_errors=2) as bus:
+        bus.subscribe(SpeciesAdded, fail)
+
+        for number in range(3):
+            bus.publish([SpeciesAdded(f"species-000{number}", "Hakea varia")])
+            bus.flush()
+
+    assert len(bus.errors) == 2
+    assert [record.message for record in caplog.records] == ["Event handler failed"] * 3
+
+
+def test_should_dispatch_on_background_worker(recorder):
+    with MessageBus(background=True, linger=0.01) as bus:
+        bus.subscribe(SpeciesAdded, recorder)
+        uow = MemoryUnitOfWork(bus=bus)
+
+        references = [services.add_species(name, uow) for name in ("Acacia saligna", "Hakea varia")]
+        bus.flush()
+
+        assert [event.reference for event in recorder.events] == references
+        assert recorder.threads == {"messagebus"}
+
+
+def test_should_drain_queue_on_close(recorder):
+    bus = MessageBus(background=True, linger=1.0)
+    bus.subscribe(SpeciesAdded, recorder)
+
+    bus.publish([SpeciesAdded(f"species-{n}", "Hakea varia") for n in range(3)])
+    bus.close()
+
+    assert len(recorder.events) == 3
@@ -0,0 +1,83 @@
+import pytest
+
+from leaftracker.domain.model import Species, TaxonHistory
+from leaftracker.domain.name_index import TaxonNameIndex
+
+
+@pytest.fixture
+def index() -> TaxonNameIndex:
+    juncea = Species("Machaerina juncea", reference="species-0001")
+    juncea.taxon_history.add_previous_name("Baumea juncea")
+
+    return TaxonNameIndex.from_species([
+        juncea,
+        Species("Acacia saligna", reference="species-0002"),
+        Species("Acacia dentifera", reference="species-0003"),
+        Species("Hakea petiolaris trichophylla", reference="species-0004"),
+    ])
+
+
+class TestTaxonNameIndex:
+    def test_should_find_by_genus_prefix(self, index):
+        assert index.prefix("Acac") == ["species-0002", "species-0003"]
+
+    def test_should_find_by_species_prefix(self, index):
+        assert index.prefix("salig") == ["species-0002"]
+
+    def test_should_find_by_full_name(self, index):
+        assert index.prefix("acacia  SALIGNA") == ["species-0002"]
+
+    def test_should_find_by_previous_name(self, index):
+        assert index.prefix("Baumea") == ["species-0001"]
+
+    def test_should_find_subspecies(self, index):
+        assert index.prefix("hakea petiolaris tri") == ["species-0004"]
+
+    def test_should_find_nothing(self, index):
+        assert index.prefix("Eucalyptus") == []
+
+    def test_should_limit_matches(self, index):
+        assert len(index.prefix("acacia", limit=1)) == 1
+
+    def test_should_tolerate_typos(self, index):
+        assert index.fuzzy("Acacai saligna", max_distance=2) == ["species-0002"]
+
+    def test_should_tolerate_typos_in_prefix(self, index):
+        assert index.fuzzy("dentif3r", max_distance=1) == ["species-0003"]
+
+    def test_should_prefer_prefix_matches(self, index):
+        assert index.search("hakea", max_distance=1) == ["species-0004"]
+
+    def test_should_replace_names_when_species_is_renamed(self, index):
+        history = TaxonHistory("Acacia saligna")
+        history.new_current_name("Acacia cyclops")
+
+        index.add("species-0002", history)
+
+        assert index.prefix("cyclops") == ["species-0002"]
+        assert index.prefix("saligna") == ["species-0002"]
+
+    def test_should_remove_species(self, index):
+        index.remove("species-0002")
+
+        assert "species-0002" not in index
+        assert index.prefix("saligna") == []
+        assert len(index) == 3
+
+
+def test_should_look_up_full_names_exactly():
+    index = TaxonNameIndex()
+    index.add("species-0001", Species("Machaerina juncea").taxon_history)
+    index.add("species-0002", Species("Juncea juncea").taxon_history)
+
+    assert index.lookup("machaerina  JUNCEA") == ["species-0001"]
+    assert index.lookup("juncea") == []
+
+
+def test_should_forget_removed_names_on_lookup():
+    index = TaxonNameIndex()
+    history = Species("Baumea juncea").taxon_history
+    index.add("species-0001", history)
+    index.remove("species-0001")
+
+    assert index.lookup("Baumea juncea") == []
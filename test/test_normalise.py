@@ -0,0 +1,31 @@
+from leaftracker.domain.normalise import NormalisedName, normalise_names
+
+NAMES = ["acacia SALIGNA", "Machaerina", "  Banksia  sessilis cygnorum ", "Baumea juncea var. nova extra"]
+
+
+def test_should_normalise_small_lists_in_process():
+    assert list(normalise_names(NAMES)) == [
+        NormalisedName(0, "acacia SALIGNA", "Acacia saligna"),
+        NormalisedName(1, "Machaerina", error=(
+            "Taxon must have two or three ranks. Genus, species and optionally subspecies."
+        )),
+        NormalisedName(2, "  Banksia  sessilis cygnorum ", "Banksia sessilis cygnorum"),
+        NormalisedName(3, "Baumea juncea var. nova extra", error=(
+            "Taxon must have two or three ranks. Genus, species and optionally subspecies."
+        )),
+    ]
+
+
+def test_should_keep_order_across_processes():
+    names = [f"genus{number % 7} species{number}" for number in range(1000)]
+
+    results = list(normalise_names(names, processes=2, chunk_size=37, parallel_threshold=0))
+
+    assert [result.position for result in results] == list(range(1000))
+    assert [result.name for result in results] == [name.capitalize() for name in names]
+
+
+def test_should_report_failures_per_row():
+    results = normalise_names(iter(["Acacia", "Acacia saligna"] * 3), chunk_size=4)
+
+    assert [result.ok for result in results] == [False, True] * 3
@@ -1,11 +1,17 @@
-from conftest import references
+from leaftracker.adapters.memory_repository import MemoryStore
 
 
 def test_should_use_prefix():
-    refs = references(prefix="prefix")
-    assert next(refs) == "prefix-0001"
+    store = MemoryStore()
+    assert store.next_reference("prefix") == "prefix-0001"
 
 
 def test_should_increment():
-    refs = references(prefix="prefix")
-    assert [next(refs), next(refs)] == ["prefix-0001", "prefix-0002"]
+    store = MemoryStore()
+    assert [store.next_reference("prefix"), store.next_reference("prefix")] == ["prefix-0001", "prefix-0002"]
+
+
+def test_should_count_each_prefix_separately():
+    store = MemoryStore()
+    store.next_reference("species")
+    assert store.next_reference("batch") == "batch-0001"
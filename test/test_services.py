@@ -1,15 +1,19 @@
 import pytest
 
-from conftest import FakeBatchRepository, FakeUnitOfWork, FakeSpeciesRepository
-from leaftracker.adapters.repository import BatchRepository
+from leaftracker.adapters.memory_repository import MemoryBatchRepository, MemoryStore
+from leaftracker.adapters.repository import BatchRepository, ConcurrentModification
 from leaftracker.domain.model import Batch, Source, SourceType, BatchType, Stock, StockSize, TaxonName
+from leaftracker.domain.name_index import TaxonNameIndex
 from leaftracker.service_layer import services
-from leaftracker.service_layer.services import InvalidSource, add_species, rename_species, ServiceError
+from leaftracker.service_layer.memory_uow import MemoryUnitOfWork
+from leaftracker.service_layer.services import (
+    InvalidSource, add_species, rename_species, rename_species_many, retry_on_conflict, ServiceError
+)
 from leaftracker.service_layer.unit_of_work import UnitOfWork
 
 
-def test_fake_reference():
-    repo: BatchRepository = FakeBatchRepository([])
+def test_batch_reference():
+    repo: BatchRepository = MemoryBatchRepository(MemoryStore())
 
     references = [repo.add(Batch(Source("Habitat Links", SourceType.PROGRAM), BatchType.DELIVERY)),
                   repo.add(Batch(Source("Habitat Links", SourceType.PROGRAM), BatchType.DELIVERY)),
@@ -20,7 +24,7 @@ def test_fake_reference():
 
 @pytest.fixture
 def uow() -> UnitOfWork:
-    return FakeUnitOfWork()
+    return MemoryUnitOfWork()
 
 
 def test_should_catalogue_batch(uow):
@@ -100,7 +104,7 @@ def test_add_species(uow):
 
 
 def test_rename_species():
-    uow = FakeUnitOfWork()
+    uow = MemoryUnitOfWork()
     reference = add_species("Baumea juncea", uow)
     assert reference == "species-0001"
     species = uow.species().get("species-0001")
@@ -110,21 +114,106 @@ def test_rename_species():
     assert species.taxon_history.current() == TaxonName("Machaerina juncea")
 
 
-def test_reference_not_assigned_when_adding_species():
-    def none_reference():
-        yield None
+class UncommittedUnitOfWork(MemoryUnitOfWork):
+    def commit(self) -> None:
+        self.rollback()
+
 
-    uow = FakeUnitOfWork()
-    repository = FakeSpeciesRepository()
-    repository.references = none_reference()
-    uow.set_species(repository)
+def test_reference_not_assigned_when_adding_species():
+    uow = UncommittedUnitOfWork()
 
     with pytest.raises(ServiceError):
         _ = add_species("Baumea juncea", uow)
 
 
 def test_rename_non_existent_species():
-    uow = FakeUnitOfWork()
+    uow = MemoryUnitOfWork()
 
     with pytest.raises(ServiceError):
         rename_species("xyz", "Machaerina juncea", uow)
+
+
+def test_rename_many_species():
+    uow = MemoryUnitOfWork()
+    baumea = add_species("Baumea juncea", uow)
+    acacia = add_species("Acacia saligna", uow)
+
+    rename_species_many({baumea: "Machaerina juncea", acacia: "Acacia cyclops"}, uow)
+
+    assert uow.species().get(baumea).taxon_history.current() == TaxonName("Machaerina juncea")  # type: ignore
+    assert uow.species().get(acacia).taxon_history.current() == TaxonName("Acacia cyclops")  # type: ignore
+
+
+def test_retry_rename_many_without_repeating_names():
+    uow = MemoryUnitOfWork()
+    acacia = add_species("Acacia saligna", uow)
+
+    rename_species_many({acacia: "Acacia cyclops"}, uow)
+    rename_species_many({acacia: "Acacia cyclops"}, uow)
+
+    history = uow.species().get(acacia).taxon_history  # type: ignore
+    assert [str(name) for name in history] == ["Acacia saligna", "Acacia cyclops"]
+
+
+def test_rename_many_with_missing_species():
+    uow = MemoryUnitOfWork()
+    baumea = add_species("Baumea juncea", uow)
+
+    with pytest.raises(ServiceError, match="xyz"):
+        rename_species_many({baumea: "Machaerina juncea", "xyz": "Acacia cyclops"}, uow)
+
+
+def conflicting(times: int):
+    attempts = []
+
+    def service(reference: str) -> str:
+        attempts.append(reference)
+        if len(attempts) <= times:
+            raise ConcurrentModification([reference])
+        return reference
+
+    return service, attempts
+
+
+def test_retry_on_conflict():
+    service, attempts = conflicting(times=2)
+    assert retry_on_conflict(service, "species-0001", attempts=3) == "species-0001"
+    assert len(attempts) == 3
+
+
+def test_retry_forwards_keyword_arguments():
+    uow = MemoryUnitOfWork()
+    name_index = TaxonNameIndex()
+
+    reference = retry_on_conflict(add_species, "Acacia saligna", uow, name_index=name_index)
+
+    assert name_index.lookup("Acacia saligna") == [reference]
+
+
+def test_give_up_after_repeated_conflicts():
+    service, attempts = conflicting(times=3)
+
+    with pytest.raises(ConcurrentModification):
+        retry_on_conflict(service, "species-0001", attempts=3)
+
+    assert len(attempts) == 3
+
+
+def test_keep_name_index_up_to_date():
+    uow = MemoryUnitOfWork()
+    name_index = TaxonNameIndex()
+
+    reference = add_species("Baumea juncea", uow, name_index)
+    rename_species(reference, "Machaerina juncea", uow, name_index)
+
+    assert name_index.prefix("machaerina") == [reference]
+    assert name_index.prefix("baumea") == [reference]
+
+
+def test_build_name_index():
+    uow = MemoryUnitOfWork()
+    reference = add_species("Acacia saligna", uow)
+
+    name_index = services.build_name_index(uow)
+
+    assert name_index.prefix("saligna") == [reference]
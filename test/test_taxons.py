@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from leaftracker.domain.model import TaxonHistory, TaxonName, MalformedTaxonName
@@ -70,6 +72,29 @@ class TestTaxonName:
         with pytest.raises(MalformedTaxonName):
             taxon = TaxonName(species_name)
 
+    def test_should_share_parts_of_repeated_names(self):
+        assert TaxonName("Acacia saligna").genus is TaxonName("Acacia saligna").genus
+
+    def test_should_hash_equal_names_equally(self):
+        names = {TaxonName("Acacia saligna"), TaxonName("acacia saligna"), TaxonName("Acacia cyclops")}
+        assert len(names) == 2
+
+    def test_should_expose_normalised_parts(self):
+        taxon = TaxonName("hakea PETIOLARIS Trichophylla")
+        assert (taxon.genus, taxon.species, taxon.subspecies) == ("Hakea", "petiolaris", "trichophylla")
+
+    def test_should_have_no_subspecies(self):
+        assert TaxonName("Acacia saligna").subspecies is None
+
+    def test_should_be_immutable(self):
+        taxon = TaxonName("Acacia saligna")
+        with pytest.raises(AttributeError):
+            taxon.genus = "Hakea"  # type: ignore
+
+    def test_should_pickle_to_equal_name(self):
+        taxon = TaxonName("Acacia saligna")
+        assert pickle.loads(pickle.dumps(taxon)) == taxon
+
 
 class TestTaxonHistory:
     def test_should_initialize_with_current_name(self):